@@ -1,8 +1,12 @@
 import os
-from typing import Optional
+import tempfile
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
+
+
+def _getenv_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
 
 
 class AppConfig:
@@ -25,6 +29,91 @@ class AppConfig:
         self.temperature: float = float(os.getenv("TEMPERATURE", "0"))
         self.batch_size: int = int(os.getenv("BATCH_SIZE", "10"))
         self.concurrent_batches: int = int(os.getenv("CONCURRENT_BATCHES", "1"))
+        self.incremental_translation: bool = _getenv_bool("INCREMENTAL_TRANSLATION")
+        self.incremental_context_segments: int = int(
+            os.getenv("INCREMENTAL_CONTEXT_SEGMENTS", "2")
+        )
+        self.save_audio_file: bool = _getenv_bool("SAVE_AUDIO_FILE")
+        self.media_cache_dir: str = os.getenv(
+            "MEDIA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "llm-asr-media")
+        )
+        self.prefetch_inputs: int = int(os.getenv("PREFETCH_INPUTS", "2"))
+
+        # Audio preprocessing: "auto" picks a preset from a quick analysis pass
+        self.audio_preset: str = os.getenv("AUDIO_PRESET", "auto")
+        self.audio_analysis_seconds: float = float(
+            os.getenv("AUDIO_ANALYSIS_SECONDS", "30")
+        )
+        self.audio_min_snr_db: float = float(os.getenv("AUDIO_MIN_SNR_DB", "30"))
+        self.audio_min_loudness_db: float = float(
+            os.getenv("AUDIO_MIN_LOUDNESS_DB", "-30")
+        )
+        self.audio_max_loudness_db: float = float(
+            os.getenv("AUDIO_MAX_LOUDNESS_DB", "-14")
+        )
+
+        # Optional draft model for draft-then-refine translation
+        self.draft_llm_model_name: str = os.getenv("DRAFT_LLM_MODEL_NAME", "")
+        self.draft_llm_model_provider: str = os.getenv(
+            "DRAFT_LLM_MODEL_PROVIDER", self.llm_model_provider
+        )
+        self.draft_llm_api_base: str = os.getenv("DRAFT_LLM_API_BASE", "")
+        self.draft_min_length_ratio: float = float(
+            os.getenv("DRAFT_MIN_LENGTH_RATIO", "0.3")
+        )
+        self.draft_max_length_ratio: float = float(
+            os.getenv("DRAFT_MAX_LENGTH_RATIO", "3.0")
+        )
+        self.draft_min_target_ratio: float = float(
+            os.getenv("DRAFT_MIN_TARGET_RATIO", "0.2")
+        )
+
+        # Multi-provider routing, e.g. "openai:gpt-4o-mini@3,google_genai:gemini-2.0-flash@1".
+        # Append "=<base_url>" to an endpoint to send it to its own server
+        self.llm_router_endpoints: str = os.getenv("LLM_ROUTER_ENDPOINTS", "")
+        self.llm_hedge_percentile: float = float(
+            os.getenv("LLM_HEDGE_PERCENTILE", "0.95")
+        )
+        self.llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "5"))
+        self.llm_router_window: int = int(os.getenv("LLM_ROUTER_WINDOW", "50"))
+
+        # Pipeline service
+        self.service_host: str = os.getenv("SERVICE_HOST", "127.0.0.1")
+        self.service_port: int = int(os.getenv("SERVICE_PORT", "8080"))
+        self.service_db_path: str = os.getenv("SERVICE_DB_PATH", "jobs.sqlite3")
+        # The Streamlit app runs its own service, so it must not share the job DB
+        self.streamlit_db_path: str = os.getenv(
+            "STREAMLIT_DB_PATH", "streamlit_jobs.sqlite3"
+        )
+        self.service_output_dir: str = os.getenv("SERVICE_OUTPUT_DIR", "outputs")
+        self.service_queue_size: int = int(os.getenv("SERVICE_QUEUE_SIZE", "16"))
+        self.asr_workers: int = int(os.getenv("ASR_WORKERS", "1"))
+        self.llm_workers: int = int(os.getenv("LLM_WORKERS", "4"))
+        # Off (1) by default; queued clips up to one 30 s Whisper window are
+        # transcribed together when raised
+        self.transcribe_batch_size: int = int(os.getenv("TRANSCRIBE_BATCH_SIZE", "1"))
+        self.batch_max_clip_seconds: float = float(
+            os.getenv("BATCH_MAX_CLIP_SECONDS", "30")
+        )
+
+        # Logging: records are written by a background thread
+        self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
+        self.log_format: str = os.getenv("LOG_FORMAT", "text")
+        self.log_batch_sample_rate: float = float(
+            os.getenv("LOG_BATCH_SAMPLE_RATE", "1.0")
+        )
+
+        # Live captioning
+        self.live_latency_budget: float = float(os.getenv("LIVE_LATENCY_BUDGET", "4.0"))
+        self.live_max_utterance: float = float(os.getenv("LIVE_MAX_UTTERANCE", "6.0"))
+        self.live_vad_aggressiveness: int = int(
+            os.getenv("LIVE_VAD_AGGRESSIVENESS", "3")
+        )
+        self.live_language: str = os.getenv("LIVE_LANGUAGE", "")
+
+        # Chat model clients are reused across calls and jobs
+        self._llm_clients: Dict[Tuple[Any, ...], Any] = {}
+        self._llm_routers: Dict[Tuple[Any, ...], Any] = {}
 
     def set_whisper_model(self, model_size: str) -> "AppConfig":
         self.whisper_model_size = model_size
@@ -42,14 +131,140 @@ class AppConfig:
         self.temperature = temperature
         return self
 
+    def set_incremental_translation(
+        self, incremental_translation: bool, context_segments: Optional[int] = None
+    ) -> "AppConfig":
+        self.incremental_translation = incremental_translation
+        if context_segments is not None:
+            self.incremental_context_segments = context_segments
+        return self
+
+    def set_save_audio_file(self, save_audio_file: bool) -> "AppConfig":
+        self.save_audio_file = save_audio_file
+        return self
+
+    def set_media_cache_dir(self, media_cache_dir: str) -> "AppConfig":
+        self.media_cache_dir = media_cache_dir
+        return self
+
+    def set_prefetch_inputs(self, prefetch_inputs: int) -> "AppConfig":
+        self.prefetch_inputs = prefetch_inputs
+        return self
+
+    def set_audio_preset(self, audio_preset: str) -> "AppConfig":
+        self.audio_preset = audio_preset
+        return self
+
+    def set_draft_llm_model(
+        self, model_name: str, model_provider: str = "", api_base: str = ""
+    ) -> "AppConfig":
+        self.draft_llm_model_name = model_name
+        self.draft_llm_model_provider = model_provider or self.llm_model_provider
+        self.draft_llm_api_base = api_base
+        return self
+
+    def set_llm_router_endpoints(self, endpoints: str) -> "AppConfig":
+        self.llm_router_endpoints = endpoints
+        return self
+
+    def set_transcribe_batch_size(self, batch_size: int) -> "AppConfig":
+        self.transcribe_batch_size = batch_size
+        return self
+
+    def set_logging(
+        self,
+        level: Optional[str] = None,
+        log_format: Optional[str] = None,
+        batch_sample_rate: Optional[float] = None,
+    ) -> "AppConfig":
+        if level is not None:
+            self.log_level = level
+        if log_format is not None:
+            self.log_format = log_format
+        if batch_sample_rate is not None:
+            self.log_batch_sample_rate = batch_sample_rate
+
+        from utils.logging import configure_logging
+
+        configure_logging()
+        return self
+
+    def set_live_latency_budget(self, latency_budget: float) -> "AppConfig":
+        self.live_latency_budget = latency_budget
+        return self
+
+    @property
+    def draft_translation_enabled(self) -> bool:
+        return bool(self.draft_llm_model_name)
+
     def get_llm_model(self):
+        if self.llm_router_endpoints:
+            return self.get_llm_router()
         if not self.llm_model_name:
             raise ValueError("LLM model name is not set")
         if not self.llm_model_provider:
             raise ValueError("LLM model provider is not set")
 
-        return init_chat_model(
-            model=self.llm_model_name,
-            model_provider=self.llm_model_provider,
-            temperature=self.temperature,
+        return self._get_chat_model(
+            self.llm_model_name, self.llm_model_provider, self.temperature
         )
+
+    def get_llm_router(self):
+        """Return a router over the endpoints in `llm_router_endpoints`"""
+        from config.llm_router import LLMEndpoint, LLMRouter, parse_endpoints
+
+        key = (
+            self.llm_router_endpoints,
+            self.temperature,
+            self.llm_hedge_percentile,
+            self.llm_hedge_min_samples,
+            self.llm_router_window,
+        )
+        if key not in self._llm_routers:
+            endpoints = [
+                LLMEndpoint(
+                    provider,
+                    model,
+                    self._get_chat_model(model, provider, self.temperature, base_url),
+                    weight,
+                    self.llm_router_window,
+                )
+                for provider, model, weight, base_url in parse_endpoints(
+                    self.llm_router_endpoints
+                )
+            ]
+            self._llm_routers[key] = LLMRouter(
+                endpoints,
+                hedge_percentile=self.llm_hedge_percentile,
+                min_samples=self.llm_hedge_min_samples,
+            )
+        return self._llm_routers[key]
+
+    def get_draft_llm_model(self):
+        if not self.draft_llm_model_name:
+            raise ValueError("Draft LLM model name is not set")
+        if not self.draft_llm_model_provider:
+            raise ValueError("Draft LLM model provider is not set")
+
+        return self._get_chat_model(
+            self.draft_llm_model_name,
+            self.draft_llm_model_provider,
+            self.temperature,
+            self.draft_llm_api_base,
+        )
+
+    def _get_chat_model(
+        self, model_name: str, model_provider: str, temperature: float, base_url=""
+    ):
+        key = (model_name, model_provider, temperature, base_url)
+        if key not in self._llm_clients:
+            from langchain.chat_models import init_chat_model
+
+            kwargs = {"base_url": base_url} if base_url else {}
+            self._llm_clients[key] = init_chat_model(
+                model=model_name,
+                model_provider=model_provider,
+                temperature=temperature,
+                **kwargs,
+            )
+        return self._llm_clients[key]
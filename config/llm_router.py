@@ -0,0 +1,264 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.event_loop import run_coroutine
+from utils.logging import setup_logger
+
+
+def parse_endpoints(spec: str) -> List[Tuple[str, str, float, str]]:
+    """
+    Parse an endpoint list such as
+    `openai:gpt-4o-mini@3=https://api.openai.com/v1, google_genai:gemini-2.0-flash@1`
+    into `(provider, model, weight, base_url)` tuples. The weight defaults to 1
+    and the base URL to the provider's default.
+    """
+    endpoints = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ":" not in item:
+            raise ValueError(
+                f"Invalid LLM endpoint '{item}'. "
+                "Expected provider:model[@weight][=base_url]"
+            )
+        item, _, base_url = item.partition("=")
+        provider, model = item.split(":", 1)
+        weight = 1.0
+        if "@" in model:
+            model, weight_text = model.rsplit("@", 1)
+            weight = float(weight_text)
+        endpoints.append((provider.strip(), model.strip(), weight, base_url.strip()))
+    return endpoints
+
+
+class LLMEndpoint:
+    """A provider/model chat client with rolling latency and error statistics"""
+
+    def __init__(
+        self, provider: str, model: str, client: Any, weight: float, window: int
+    ) -> None:
+        self.provider = provider
+        self.model = model
+        self.client = client
+        self.weight = weight
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    @property
+    def effective_weight(self) -> float:
+        """Configured weight, reduced as the endpoint's recent error rate rises"""
+        return self.weight * max(1 - self.error_rate, 0.05) ** 2
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        with self._lock:
+            if not self.latencies:
+                return None
+            latencies = sorted(self.latencies)
+        index = min(int(percentile * len(latencies)), len(latencies) - 1)
+        return latencies[index]
+
+    def sample_count(self) -> int:
+        with self._lock:
+            return len(self.latencies)
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> Any:
+        """Call the endpoint and record latency, outcome and token usage"""
+        started = time.monotonic()
+        try:
+            response = await self.client.ainvoke(prompt, **kwargs)
+        except Exception:
+            with self._lock:
+                self.outcomes.append(False)
+            raise
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        with self._lock:
+            self.latencies.append(time.monotonic() - started)
+            self.outcomes.append(True)
+            self.input_tokens += usage.get("input_tokens", 0)
+            self.output_tokens += usage.get("output_tokens", 0)
+        return response
+
+
+class LLMRouter:
+    """
+    Routes chat requests across several provider/model endpoints.
+
+    Endpoints are picked by weight, reduced by their rolling error rate. When a
+    request is still running after the endpoint's `hedge_percentile` latency, a
+    duplicate request is sent to the next endpoint and the first response wins;
+    the losing request is cancelled. Failed requests fail over to the next
+    endpoint.
+
+    The winning endpoint is recorded in
+    `response.response_metadata["llm_endpoint"]` so token usage can be
+    attributed per endpoint. The cost of losing hedges goes in
+    `response.response_metadata["llm_hedged_usage"]`, one
+    `{"llm_endpoint", "input_tokens", "output_tokens", "cancelled"}` entry per
+    loser. A cancelled loser never reports usage, so it is counted with the
+    winner's input tokens (the prompt it was sent) and no output tokens.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[LLMEndpoint],
+        hedge_percentile: float = 0.95,
+        min_samples: int = 5,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("LLM router needs at least one endpoint")
+        self.endpoints = endpoints
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.logger = setup_logger(f"{self.__class__.__name__}")
+
+    def invoke(self, prompt: Any, **kwargs: Any) -> Any:
+        return run_coroutine(self.ainvoke(prompt, **kwargs))
+
+    async def ainvoke(self, prompt: Any, **kwargs: Any) -> Any:
+        candidates = self._ranked_endpoints()
+        pending: Dict[asyncio.Task, LLMEndpoint] = {}
+        last_error: Optional[Exception] = None
+        hedged = False
+
+        def launch() -> LLMEndpoint:
+            endpoint = candidates.pop(0)
+            task = asyncio.ensure_future(endpoint.ainvoke(prompt, **kwargs))
+            pending[task] = endpoint
+            return endpoint
+
+        primary = launch()
+        try:
+            while pending:
+                hedge_delay = None
+                if not hedged and candidates:
+                    hedge_delay = self._hedge_delay(primary)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedged = True
+                    hedge = launch()
+                    self.logger.info(
+                        "%s exceeded %.2fs, hedging with %s",
+                        primary.name,
+                        hedge_delay,
+                        hedge.name,
+                    )
+                    continue
+
+                responses = []
+                for task in done:
+                    endpoint = pending.pop(task)
+                    try:
+                        responses.append((endpoint, task.result()))
+                    except Exception as e:
+                        last_error = e
+                        self.logger.warning("%s failed: %s", endpoint.name, e)
+                        if not pending and candidates:
+                            primary = launch()
+                            self.logger.info("Failing over to %s", primary.name)
+
+                if responses:
+                    return self._finish(responses, pending)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error or RuntimeError("All LLM endpoints failed")
+
+    def _finish(
+        self,
+        responses: List[Tuple[LLMEndpoint, Any]],
+        pending: Dict[asyncio.Task, LLMEndpoint],
+    ) -> Any:
+        """
+        Return the first response, with the endpoint that served it and the
+        usage of every losing request recorded in its metadata
+        """
+        (endpoint, response), losers = responses[0], responses[1:]
+        usage = getattr(response, "usage_metadata", None) or {}
+
+        hedged_usage = []
+        # Requests that completed in the same wait as the winner
+        for loser, loser_response in losers:
+            loser_usage = getattr(loser_response, "usage_metadata", None) or {}
+            hedged_usage.append(
+                {
+                    "llm_endpoint": loser.name,
+                    "input_tokens": loser_usage.get("input_tokens", 0),
+                    "output_tokens": loser_usage.get("output_tokens", 0),
+                    "cancelled": False,
+                }
+            )
+        for task, loser in pending.items():
+            task.cancel()
+            hedged_usage.append(
+                {
+                    "llm_endpoint": loser.name,
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": 0,
+                    "cancelled": True,
+                }
+            )
+        pending.clear()
+
+        metadata = getattr(response, "response_metadata", None)
+        if isinstance(metadata, dict):
+            metadata["llm_endpoint"] = endpoint.name
+            if hedged_usage:
+                metadata["llm_hedged_usage"] = hedged_usage
+        return response
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Rolling statistics and total token usage per endpoint"""
+        return [
+            {
+                "endpoint": endpoint.name,
+                "weight": endpoint.weight,
+                "error_rate": endpoint.error_rate,
+                "latency_p50": endpoint.latency_percentile(0.5),
+                f"latency_p{int(self.hedge_percentile * 100)}": (
+                    endpoint.latency_percentile(self.hedge_percentile)
+                ),
+                "input_tokens": endpoint.input_tokens,
+                "output_tokens": endpoint.output_tokens,
+            }
+            for endpoint in self.endpoints
+        ]
+
+    def _hedge_delay(self, endpoint: LLMEndpoint) -> Optional[float]:
+        if endpoint.sample_count() < self.min_samples:
+            return None
+        return endpoint.latency_percentile(self.hedge_percentile)
+
+    def _ranked_endpoints(self) -> List[LLMEndpoint]:
+        """Weighted random order: the primary first, then failover/hedge targets"""
+        remaining = list(self.endpoints)
+        ranked = []
+        while remaining:
+            weights = [endpoint.effective_weight for endpoint in remaining]
+            endpoint = random.choices(remaining, weights=weights)[0]
+            remaining.remove(endpoint)
+            ranked.append(endpoint)
+        return ranked
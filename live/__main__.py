@@ -0,0 +1,54 @@
+import argparse
+import json
+
+from live.captioner import CueWriter, LiveCaptioner
+from live.stream import iter_frames, open_stream
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m live",
+        description="Caption a live audio stream in real time.",
+    )
+    parser.add_argument(
+        "source",
+        help="ffmpeg-readable source: RTMP/HLS URL, named pipe, or - for stdin",
+    )
+    parser.add_argument("--format", choices=["vtt", "srt"], default="vtt")
+    parser.add_argument("--output", help="Caption file; captions go to stdout if unset")
+    parser.add_argument(
+        "--max-cues", type=int, default=0, help="Keep only the latest cues in the file"
+    )
+    parser.add_argument("--latency-budget", type=float, help="Seconds per caption")
+    parser.add_argument("--language", help="Spoken language, skips detection")
+    parser.add_argument(
+        "--no-translate", action="store_true", help="Emit transcripts only"
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Read the source at its native rate (use a file as a live stand-in)",
+    )
+    args = parser.parse_args()
+
+    writer = CueWriter(args.format, args.output, args.max_cues)
+    captioner = LiveCaptioner(
+        writer,
+        translate=not args.no_translate,
+        latency_budget=args.latency_budget,
+        language=args.language,
+    )
+
+    process = open_stream(args.source, realtime=args.realtime)
+    try:
+        stats = captioner.run(iter_frames(process.stdout))
+    except KeyboardInterrupt:
+        stats = captioner.stats()
+    finally:
+        process.terminate()
+
+    captioner.logger.info(f"Live captioning finished: {json.dumps(stats)}")
+
+
+if __name__ == "__main__":
+    main()
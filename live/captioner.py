@@ -0,0 +1,287 @@
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from config.app_config import AppConfig
+from live.segmenter import Utterance, UtteranceSegmenter
+from processors.transcriber import use_whisper_model
+from utils import prompt_template
+from utils.logging import setup_logger
+from utils.time import format_timestamp
+from workflow.state import State
+
+
+class Cue(NamedTuple):
+    index: int
+    start: float
+    end: float
+    text: str
+    source_text: str
+
+
+class CueWriter:
+    """
+    Writes cues as SRT or WebVTT, either to stdout or to a file. With
+    `max_cues`, the file is rewritten to hold only the latest cues (a rolling
+    caption file); otherwise cues are appended.
+    """
+
+    def __init__(
+        self, fmt: str = "vtt", output_path: Optional[str] = None, max_cues: int = 0
+    ) -> None:
+        if fmt not in ("srt", "vtt"):
+            raise ValueError(f"Unknown caption format '{fmt}'. Expected srt or vtt")
+        self.fmt = fmt
+        self.output_path = output_path
+        self.cues: deque = deque(maxlen=max_cues or None)
+        self.rolling = bool(max_cues)
+
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(self._header())
+        else:
+            sys.stdout.write(self._header())
+            sys.stdout.flush()
+
+    def write(self, cue: Cue) -> None:
+        block = self._format(cue)
+        if not self.output_path:
+            sys.stdout.write(block)
+            sys.stdout.flush()
+            return
+
+        if not self.rolling:
+            with open(self.output_path, "a", encoding="utf-8") as f:
+                f.write(block)
+            return
+
+        self.cues.append(cue)
+        temp_path = f"{self.output_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self._header())
+            f.write("".join(self._format(rolling_cue) for rolling_cue in self.cues))
+        os.replace(temp_path, self.output_path)
+
+    def _header(self) -> str:
+        return "WEBVTT\n\n" if self.fmt == "vtt" else ""
+
+    def _format(self, cue: Cue) -> str:
+        start = format_timestamp(cue.start)
+        end = format_timestamp(cue.end)
+        if self.fmt == "vtt":
+            start, end = start.replace(",", "."), end.replace(",", ".")
+        return f"{cue.index}\n{start} --> {end}\n{cue.text}\n\n"
+
+
+class LiveCaptioner:
+    """
+    Transcribes and translates a live audio stream utterance by utterance.
+
+    Frames are cut into utterances by `UtteranceSegmenter`. A Whisper thread
+    transcribes them while translations run on a small executor, and an emitter
+    thread writes cues in order. A translation that would push a cue past
+    `latency_budget` seconds (measured from when the utterance's last audio
+    arrived) is abandoned and the transcript is emitted instead; translations
+    still queued once their budget has expired are never sent. When the backlog
+    queue is full the oldest pending utterance is dropped.
+    """
+
+    def __init__(
+        self,
+        writer: CueWriter,
+        translate: bool = True,
+        latency_budget: Optional[float] = None,
+        language: Optional[str] = None,
+        backlog_size: int = 16,
+    ) -> None:
+        self.config = AppConfig()
+        self.logger = setup_logger(f"{self.__class__.__name__}")
+        self.writer = writer
+        self.translate = translate
+        self.latency_budget = (
+            self.config.live_latency_budget
+            if latency_budget is None
+            else latency_budget
+        )
+        self.language = language or self.config.live_language or None
+        self.segmenter = UtteranceSegmenter(
+            aggressiveness=self.config.live_vad_aggressiveness,
+            max_duration=self.config.live_max_utterance,
+        )
+        self.state = State()
+
+        self._utterances: queue.Queue = queue.Queue(maxsize=backlog_size)
+        self._transcripts: queue.Queue = queue.Queue()
+        self._translation_executor = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="live-translate"
+        )
+        # Translations finish on several executor threads
+        self._usage_lock = threading.Lock()
+        self._lags: list = []
+        self._max_backlog = 0
+        self._dropped = 0
+        self._untranslated = 0
+
+    @property
+    def backlog(self) -> int:
+        """Utterances waiting for transcription or emission"""
+        return self._utterances.qsize() + self._transcripts.qsize()
+
+    def run(self, frames: Iterable[Tuple[bytes, float, float]]) -> Dict[str, Any]:
+        """Caption a frame stream until it ends and return latency statistics"""
+        from processors.translator import WhisperTranslator
+
+        self._translator = WhisperTranslator("live_translate")
+        if self.translate:
+            self._llm = self.config.get_llm_model()
+
+        asr_thread = threading.Thread(target=self._transcribe_loop, daemon=True)
+        emit_thread = threading.Thread(target=self._emit_loop, daemon=True)
+        asr_thread.start()
+        emit_thread.start()
+
+        for utterance in self.segmenter.segment(frames):
+            self._enqueue(utterance)
+
+        self._utterances.put(None)
+        asr_thread.join()
+        emit_thread.join()
+        self._translation_executor.shutdown(wait=False)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        lags = self._lags
+        with self._usage_lock:
+            token_usage = {
+                name: usage.model_dump()
+                for name, usage in self.state.token_usage.items()
+            }
+        return {
+            "cues": len(lags),
+            "mean_lag": round(sum(lags) / len(lags), 3) if lags else 0.0,
+            "max_lag": round(max(lags), 3) if lags else 0.0,
+            "max_backlog": self._max_backlog,
+            "dropped": self._dropped,
+            "untranslated": self._untranslated,
+            "token_usage": token_usage,
+        }
+
+    def _enqueue(self, utterance: Utterance) -> None:
+        while True:
+            try:
+                self._utterances.put_nowait(utterance)
+                break
+            except queue.Full:
+                try:
+                    self._utterances.get_nowait()
+                    self._dropped += 1
+                    self.logger.warning("Backlog full, dropped oldest utterance")
+                except queue.Empty:
+                    pass
+        self._max_backlog = max(self._max_backlog, self.backlog)
+
+    def _transcribe_loop(self) -> None:
+        try:
+            while True:
+                utterance = self._utterances.get()
+                if utterance is None:
+                    return
+
+                try:
+                    text = self._transcribe(utterance)
+                except Exception as e:
+                    self.logger.error(
+                        "Transcription of utterance at %.1fs failed: %s",
+                        utterance.start,
+                        e,
+                    )
+                    continue
+                if not text:
+                    continue
+
+                translation = (
+                    self._translation_executor.submit(
+                        self._translate_text, utterance, text
+                    )
+                    if self.translate
+                    else None
+                )
+                self._transcripts.put((utterance, text, translation))
+        finally:
+            # Always let the emitter finish, or run() would never return
+            self._transcripts.put(None)
+
+    def _transcribe(self, utterance: Utterance) -> str:
+        with use_whisper_model(self.config.whisper_model_size) as model:
+            response = model.transcribe(
+                utterance.audio.as_float32(),
+                task="transcribe",
+                language=self.language,
+                condition_on_previous_text=False,
+                fp16=False,
+            )
+        return str(response["text"]).strip()
+
+    def _translate_text(self, utterance: Utterance, text: str) -> Optional[str]:
+        # Skip utterances whose budget ran out while they waited for a worker, so
+        # stale calls never hold up the translations of later utterances
+        if time.monotonic() - utterance.received_at >= self.latency_budget:
+            return None
+
+        prompt = prompt_template.LIVE_TRANSLATOR_TEMPLATE.format(context=text)
+        response = self._llm.invoke(prompt)
+        with self._usage_lock:
+            self._translator.track_token_usage(self.state, response)
+        return str(response.content).strip()
+
+    def _emit_loop(self) -> None:
+        index = 0
+        while True:
+            item = self._transcripts.get()
+            if item is None:
+                return
+
+            utterance, text, translation = item
+            caption = self._wait_for_translation(utterance, text, translation)
+
+            index += 1
+            self.writer.write(Cue(index, utterance.start, utterance.end, caption, text))
+
+            lag = time.monotonic() - utterance.received_at
+            self._lags.append(lag)
+            self.logger.info(
+                "Cue %d at %.1fs: lag %.2fs, backlog %d",
+                index,
+                utterance.start,
+                lag,
+                self.backlog,
+            )
+
+    def _wait_for_translation(
+        self, utterance: Utterance, text: str, translation: Optional[Future]
+    ) -> str:
+        if translation is None:
+            return text
+
+        remaining = self.latency_budget - (time.monotonic() - utterance.received_at)
+        try:
+            translated = translation.result(timeout=max(remaining, 0.0))
+            if translated:
+                return translated
+        except FutureTimeoutError:
+            translation.cancel()
+            self.logger.warning(
+                "Translation exceeded the %.1fs latency budget, emitting transcript",
+                self.latency_budget,
+            )
+        except Exception as e:
+            self.logger.warning("Translation failed (%s), emitting transcript", e)
+        self._untranslated += 1
+        return text
@@ -0,0 +1,84 @@
+from collections import deque
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+from utils.process_audio import SAMPLE_RATE, AudioBuffer
+
+
+class Utterance(NamedTuple):
+    """A speech segment cut from a live stream"""
+
+    start: float
+    end: float
+    audio: AudioBuffer
+    # Monotonic clock time at which the last frame of the utterance was read
+    received_at: float
+
+
+class UtteranceSegmenter:
+    """
+    Cuts a live PCM frame stream into utterances with webrtcvad.
+
+    An utterance starts once most frames in the padding window are voiced and
+    ends once most of them are unvoiced, or when it reaches `max_duration`
+    seconds so that long monologues still meet the latency budget.
+    """
+
+    def __init__(
+        self,
+        aggressiveness: int = 3,
+        frame_duration_ms: int = 30,
+        padding_ms: int = 300,
+        max_duration: float = 6.0,
+        trigger_ratio: float = 0.9,
+        sample_rate: int = SAMPLE_RATE,
+    ) -> None:
+        import webrtcvad
+
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self.frame_duration = frame_duration_ms / 1000.0
+        self.padding_frames = max(padding_ms // frame_duration_ms, 1)
+        self.max_duration = max_duration
+        self.trigger_ratio = trigger_ratio
+        self.sample_rate = sample_rate
+
+    def segment(
+        self, frames: Iterable[Tuple[bytes, float, float]]
+    ) -> Iterator[Utterance]:
+        """Yield utterances from `(frame, stream_time, wall_time)` tuples"""
+        ring: deque = deque(maxlen=self.padding_frames)
+        voiced: list = []
+        start = 0.0
+        triggered = False
+        threshold = self.trigger_ratio * self.padding_frames
+
+        for frame, stream_time, wall_time in frames:
+            is_speech = self.vad.is_speech(frame, self.sample_rate)
+
+            if not triggered:
+                ring.append((frame, stream_time, is_speech))
+                if sum(speech for _, _, speech in ring) > threshold:
+                    triggered = True
+                    start = ring[0][1]
+                    voiced = [buffered for buffered, _, _ in ring]
+                    ring.clear()
+                continue
+
+            voiced.append(frame)
+            ring.append((frame, stream_time, is_speech))
+            end = stream_time + self.frame_duration
+            silent = sum(not speech for _, _, speech in ring) > threshold
+            if silent or end - start >= self.max_duration:
+                yield self._utterance(voiced, start, end, wall_time)
+                triggered = False
+                voiced = []
+                ring.clear()
+
+        if triggered and voiced:
+            end = start + len(voiced) * self.frame_duration
+            yield self._utterance(voiced, start, end, wall_time)
+
+    def _utterance(
+        self, frames: list, start: float, end: float, wall_time: float
+    ) -> Utterance:
+        audio = AudioBuffer.from_pcm_bytes(b"".join(frames), self.sample_rate)
+        return Utterance(start, end, audio, wall_time)
@@ -0,0 +1,48 @@
+import subprocess
+import time
+from typing import Iterator, Tuple
+
+import ffmpeg
+
+from utils.process_audio import SAMPLE_RATE
+
+
+def open_stream(source: str, realtime: bool = False) -> subprocess.Popen:
+    """
+    Start ffmpeg decoding any ffmpeg-readable live source (RTMP/HLS URL, named
+    pipe, file, or "-" for stdin) into 16 kHz mono s16le on its stdout.
+
+    `realtime` reads the input at its native rate, which turns a local file
+    into a stand-in for a live stream.
+    """
+    input_options = {"re": None} if realtime else {}
+    global_args = ["-loglevel", "error"]
+    if source != "-":
+        # Keep ffmpeg from reading the terminal; stdin is the input otherwise
+        global_args.append("-nostdin")
+
+    return (
+        ffmpeg.input("pipe:" if source == "-" else source, **input_options)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ar=SAMPLE_RATE, ac=1)
+        .global_args(*global_args)
+        .run_async(pipe_stdout=True)
+    )
+
+
+def iter_frames(
+    pcm_stream, frame_duration_ms: int = 30, sample_rate: int = SAMPLE_RATE
+) -> Iterator[Tuple[bytes, float, float]]:
+    """
+    Read fixed-size PCM frames from a byte stream as they arrive.
+
+    Yields `(frame, stream_time, wall_time)`: the frame's offset in seconds from
+    the start of the stream, and the monotonic clock time it was read.
+    """
+    frame_bytes = int(sample_rate * frame_duration_ms / 1000) * 2
+    stream_time = 0.0
+    while True:
+        frame = pcm_stream.read(frame_bytes)
+        if len(frame) < frame_bytes:
+            return
+        yield frame, stream_time, time.monotonic()
+        stream_time += frame_duration_ms / 1000.0
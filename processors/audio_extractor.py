@@ -1,83 +1,128 @@
 import os
-import re
-import tempfile
-import uuid
-
-import yt_dlp
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
 
 from processors.base_processor import BaseProcessor
-from utils.process_audio import extract_audio_file
+from utils.acquisition import MediaAcquirer, is_remote_url, is_youtube_url
+from utils.audio_analysis import analyze_audio, select_preset
+from utils.process_audio import (
+    PRESET_FILTERS,
+    AudioBuffer,
+    apply_filters,
+    decode_audio_buffer,
+    load_audio_buffer,
+    temp_audio_path,
+    write_wav,
+)
 from workflow.state import State
 
 
 class AudioExtractor(BaseProcessor):
     """
-    Extracts audio from video files using ffmpeg and converts it to WAV format.
-    Also supports extracting audio directly from YouTube URLs.
+    Extracts audio from video files using ffmpeg into an in-memory 16 kHz mono
+    buffer. Also supports YouTube and other remote URLs, which are downloaded
+    into the media cache by `MediaAcquirer` before extraction.
+    Denoising and loudness normalization are only applied when a quick analysis
+    of the decoded audio shows they are needed (see `AppConfig.audio_preset`).
+    The WAV file is only written when `AppConfig.save_audio_file` is enabled.
     """
 
-    def _is_youtube_url(self, url: str) -> bool:
-        """Check if the given string is a YouTube URL."""
-        youtube_regex = r"(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})"
-        return bool(re.match(youtube_regex, url))
-
-    def _extract_audio_from_youtube_video(self, youtube_url: str) -> str:
-        """Download a YouTube video and return the path to the downloaded file."""
-        self.logger.info(f"Downloading YouTube video: {youtube_url}")
-        temp_dir = tempfile.gettempdir()
-        uuid_str = str(uuid.uuid4())
-        output_path = os.path.join(temp_dir, f"{uuid_str}")
-        audio_path = os.path.join(temp_dir, uuid_str + ".wav")
-        ydl_opts = {
-            "format": "bestaudio/best",
-            "postprocessors": [
-                {
-                    "key": "FFmpegExtractAudio",
-                    "preferredcodec": "wav",
-                }
-            ],
-            "postprocessor_args": [
-                "-acodec",
-                "pcm_s16le",
-                "-ar",
-                "16k",
-                "-ac",
-                "1",
-            ],
-            "outtmpl": output_path,
-        }
+    def __init__(self, node_name: str = "processor") -> None:
+        super().__init__(node_name)
+        self._acquirer: Optional[MediaAcquirer] = None
+        self._acquirer_lock = threading.Lock()
 
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([youtube_url])
+    @property
+    def acquirer(self) -> MediaAcquirer:
+        """Media downloader, created when the first remote input is acquired"""
+        with self._acquirer_lock:
+            if self._acquirer is None:
+                self._acquirer = MediaAcquirer(
+                    self.config.media_cache_dir,
+                    max_workers=self.config.prefetch_inputs,
+                )
+            return self._acquirer
 
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(
-                f"Audio extraction failed. The expected audio file was not found at {audio_path}. "
-                f"Please check if the YouTube URL is valid and accessible: {youtube_url}."
-            )
+    def prefetch(self, video_path: str) -> Optional[Future]:
+        """Start downloading a remote input in the background; local paths are ignored"""
+        if not self._is_youtube_url(video_path) and not is_remote_url(video_path):
+            return None
+        return self.acquirer.prefetch(video_path)
 
-        self.logger.info(f"YouTube audio extracted to {audio_path}")
-        return audio_path
+    def close(self) -> None:
+        """Cancel pending prefetches"""
+        if self._acquirer is not None:
+            self._acquirer.close()
 
-    def _extract_audio_from_video_file(self, file_path: str) -> str:
-        """Extract audio from video file and save as WAV format."""
+    def _is_youtube_url(self, url: str) -> bool:
+        """Check if the given string is a YouTube URL."""
+        return is_youtube_url(url)
+
+    def _extract_audio_from_video_file(
+        self, file_path: str
+    ) -> Tuple[AudioBuffer, Dict[str, Any]]:
+        """
+        Extract audio from video file into memory, choosing the filter preset
+        from an analysis of the decoded audio.
+        """
         self.logger.info("Extracting audio from video...")
+        started = time.perf_counter()
+
+        audio = decode_audio_buffer(file_path)
+        analysis = analyze_audio(audio, self.config.audio_analysis_seconds)
+
+        preset = self.config.audio_preset
+        if preset == "auto":
+            preset = select_preset(
+                analysis,
+                min_snr_db=self.config.audio_min_snr_db,
+                min_loudness_db=self.config.audio_min_loudness_db,
+                max_loudness_db=self.config.audio_max_loudness_db,
+            )
+        elif preset not in PRESET_FILTERS:
+            raise ValueError(
+                f"Unknown audio preset '{preset}'. "
+                f"Expected auto or one of: {', '.join(PRESET_FILTERS)}"
+            )
 
-        audio_path = extract_audio_file(file_path)
+        audio = apply_filters(audio, PRESET_FILTERS[preset])
+        extraction_seconds = round(time.perf_counter() - started, 3)
 
-        self.logger.info(f"Audio extracted to {audio_path}")
-        return audio_path
+        self.logger.info(
+            f"Audio extracted ({audio.duration:.2f}s) with '{preset}' preset "
+            f"in {extraction_seconds:.2f}s "
+            f"(SNR {analysis['snr_db']:.1f} dB, loudness {analysis['loudness_db']:.1f} dBFS)"
+        )
+        return audio, {
+            "preset": preset,
+            "extraction_seconds": extraction_seconds,
+            **analysis,
+        }
 
     def _process_implementation(self, state: State) -> State:
         video_path = state.video_path
         audio_path = state.audio_path
+        metadata = state.metadata
 
-        if audio_path:
+        if state.audio is not None:
             self.logger.info("Audio already extracted. Skipping extraction step.")
-            return State(**{**state.model_dump(), "audio_path": audio_path})
-        elif self._is_youtube_url(video_path):
-            audio_path = self._extract_audio_from_youtube_video(video_path)
+            return state
+        elif audio_path and os.path.exists(audio_path):
+            self.logger.info("Audio file provided. Loading it into memory...")
+            audio = load_audio_buffer(audio_path)
         else:
-            audio_path = self._extract_audio_from_video_file(video_path)
+            if self._is_youtube_url(video_path) or is_remote_url(video_path):
+                media_path = self.acquirer.acquire(video_path)
+            else:
+                media_path = video_path
+            audio, preprocessing = self._extract_audio_from_video_file(media_path)
+            metadata = {**metadata, "audio_preprocessing": preprocessing}
+            if self.config.save_audio_file:
+                audio_path = write_wav(audio, temp_audio_path(media_path))
+                self.logger.info(f"Audio saved to {audio_path}")
 
-        return State(**{**state.model_dump(), "audio_path": audio_path})
+        return state.model_copy(
+            update={"audio_path": audio_path, "audio": audio, "metadata": metadata}
+        )
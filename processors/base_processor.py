@@ -1,12 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any
-
-from langchain.prompts import PromptTemplate
+from typing import TYPE_CHECKING, Any, Optional
 
 from config.app_config import AppConfig
-from utils.logging import setup_logger
+from utils.logging import log_context, setup_logger
 from workflow.state import State
 
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
 
 class BaseProcessor(ABC):
     """Template Method Pattern for processors"""
@@ -16,25 +17,45 @@ class BaseProcessor(ABC):
         self.node_name = node_name
         self.logger = setup_logger(f"{self.__class__.__name__}")
 
-    def track_token_usage(self, state: State, response: Any) -> None:
+    def track_token_usage(
+        self, state: State, response: Any, usage_key: Optional[str] = None
+    ) -> None:
         """Track token usage from LLM response metadata"""
         if hasattr(response, "usage_metadata") and response.usage_metadata:
+            base_key = usage_key or self.node_name
+            usage_key = base_key
+
+            # Responses from LLMRouter are attributed to the endpoint that served them
+            response_metadata = getattr(response, "response_metadata", None) or {}
+            if response_metadata.get("llm_endpoint"):
+                usage_key = f"{base_key}[{response_metadata['llm_endpoint']}]"
+
             state.add_token_usage_from_metadata(
-                self.node_name,
+                usage_key,
                 response.usage_metadata,
             )
 
+            # Losing hedged requests are billed too
+            for hedged in response_metadata.get("llm_hedged_usage", []):
+                state.add_token_usage_from_metadata(
+                    f"{base_key}[{hedged['llm_endpoint']}]", hedged
+                )
+
     def process(self, state: State) -> State:
         """Template method that defines the outline of processing steps"""
-        # Hook before processing
-        state = self.before_process(state)
+        with log_context(node=self.node_name):
+            state.report_progress(self.node_name, status="started")
+
+            # Hook before processing
+            state = self.before_process(state)
 
-        # Main processing
-        state = self._process_implementation(state)
+            # Main processing
+            state = self._process_implementation(state)
 
-        # Hook after processing
-        state = self.after_process(state)
+            # Hook after processing
+            state = self.after_process(state)
 
+            state.report_progress(self.node_name, status="completed")
         return state
 
     @abstractmethod
@@ -43,7 +64,7 @@ class BaseProcessor(ABC):
         pass
 
     @property
-    def _load_prompt_template(self) -> PromptTemplate:
+    def _load_prompt_template(self) -> "PromptTemplate":
         raise NotImplementedError("PromptTemplate")
 
     def before_process(self, state: State) -> State:
@@ -1,15 +1,20 @@
-from langchain.prompts import PromptTemplate
+from typing import TYPE_CHECKING
 
 from processors.base_processor import BaseProcessor
 from utils import prompt_template
 from workflow.state import State
 
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
 
 class Summarizer(BaseProcessor):
     """Processor for text summarization"""
 
     @property
-    def _load_prompt_template(self) -> PromptTemplate:
+    def _load_prompt_template(self) -> "PromptTemplate":
+        from langchain.prompts import PromptTemplate
+
         return PromptTemplate(
             input_variables=["context"],
             template=prompt_template.SUMMARIZATION_TEMPLATE,
@@ -30,9 +35,8 @@ class Summarizer(BaseProcessor):
 
         self.logger.info("Context summary created successfully")
 
-        return State(
-            **{
-                **state.model_dump(),
+        return state.model_copy(
+            update={
                 "context": summarized_context,
                 "metadata": {
                     **state.metadata,
@@ -1,50 +1,236 @@
-import os
-
-import whisper
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from processors.audio_extractor import AudioExtractor
 from processors.base_processor import BaseProcessor
-from utils.time import fix_first_speech_timestamp
+from utils.logging import log_context
+from utils.process_audio import SAMPLE_RATE, AudioBuffer, load_audio_buffer
+from utils.time import find_first_speech_timestamp
+from workflow.segments import SegmentTable
 from workflow.state import State
 
+# Whisper decodes fixed 30 s windows; timestamp tokens step by 20 ms
+WINDOW_SECONDS = 30
+TIME_PRECISION = 0.02
 
-class TranscribeAudio(BaseProcessor):
+# Same thresholds `whisper.transcribe` uses to reject a decode
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+@lru_cache(maxsize=None)
+def load_whisper_model(model_size: str):
+    """Load a Whisper model once per process and reuse it across jobs."""
+    import whisper
+
+    return whisper.load_model(model_size)
+
+
+@lru_cache(maxsize=None)
+def _whisper_model_lock(model_size: str) -> threading.Lock:
+    return threading.Lock()
+
+
+@contextmanager
+def use_whisper_model(model_size: str) -> Iterator[Any]:
     """
-    Transcribes audio files using OpenAI's Whisper model.
+    Hold the shared Whisper model for one transcription. Whisper's decoder
+    installs kv-cache hooks on the model's modules for each decode, so two
+    threads must never decode with the same model at once.
     """
+    with _whisper_model_lock(model_size):
+        yield load_whisper_model(model_size)
 
-    def before_process(self, state: State) -> State:
-        if not state.audio_path or not os.path.exists(state.audio_path):
-            self.logger.info("No audio file found. Running AudioExtractor...")
-            audio_extractor = AudioExtractor()
-            state = audio_extractor.process(state)
-        return state
 
-    def extract_segments(self, transcript_segments, first_timestamp=0.0):
-        segments = []
-        for i, segment in enumerate(transcript_segments):
-            start_time = segment["start"] if i > 0 else first_timestamp
+def _split_segments(
+    tokenizer, tokens: Sequence[int], offset: float, duration: float
+) -> List[Dict[str, Any]]:
+    """Split decoded tokens into segments at timestamp tokens"""
+    segments = []
+    start: Optional[float] = None
+    text_tokens: List[int] = []
+    for token in tokens:
+        if token < tokenizer.timestamp_begin:
+            text_tokens.append(token)
+            continue
+
+        timestamp = (token - tokenizer.timestamp_begin) * TIME_PRECISION
+        if text_tokens:
             segments.append(
                 {
-                    "start": start_time,
-                    "end": segment["end"],
-                    "text": str(segment["text"]).strip(),
+                    "start": offset + (start or 0.0),
+                    "end": offset + timestamp,
+                    "text": tokenizer.decode(text_tokens),
                 }
             )
-        return segments
+            start, text_tokens = None, []
+        else:
+            start = timestamp
 
-    def _process_implementation(self, state: State) -> State:
-        whisper_model_size = self.config.whisper_model_size
-        self.logger.info(
-            f"Transcribing audio using Whisper {whisper_model_size} model..."
+    if text_tokens:
+        segments.append(
+            {
+                "start": offset + (start or 0.0),
+                "end": offset + duration,
+                "text": tokenizer.decode(text_tokens),
+            }
         )
+    return segments
+
+
+def transcribe_batch(
+    model,
+    audios: Sequence[AudioBuffer],
+    batch_size: int = 8,
+    language: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe many short clips with batched Whisper passes on one model.
+
+    Clips up to 30 s fill one Whisper window each, and are padded into log-Mel
+    batches of `batch_size` that go through the encoder and decoder together,
+    so each clip's language is detected once. Longer clips are transcribed
+    alone with `model.transcribe`, which seeks to the last timestamp of each
+    window instead of cutting words at fixed 30 s marks. Clips whose decode
+    looks unreliable (repetitive or low confidence) are re-run alone with
+    `model.transcribe`, which retries with temperature fallback.
+
+    Returns one `{"text", "segments", "language"}` dict per clip, with segments
+    shaped like those from `model.transcribe`.
+    """
+    import torch
+    import whisper
+    from whisper.tokenizer import get_tokenizer
+
+    if language is None and not model.is_multilingual:
+        # English-only models have no language tokens to detect with
+        language = "en"
+
+    window_samples = WINDOW_SECONDS * SAMPLE_RATE
+    clips = [{"text": "", "segments": [], "language": language} for _ in audios]
+    short_clips = []
+    for clip_index, audio in enumerate(audios):
+        samples = audio.as_float32()
+        if len(samples) <= window_samples:
+            short_clips.append((clip_index, samples))
+            continue
+
+        response = model.transcribe(
+            samples, task="transcribe", language=language, fp16=False
+        )
+        clips[clip_index].update(
+            segments=response["segments"], language=response["language"]
+        )
+
+    options = whisper.DecodingOptions(task="transcribe", language=language, fp16=False)
+    results = []
+    for batch_start in range(0, len(short_clips), batch_size):
+        batch = short_clips[batch_start : batch_start + batch_size]
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(samples), model.dims.n_mels
+                )
+                for _, samples in batch
+            ]
+        ).to(model.device)
+        results.extend(whisper.decode(model, mel, options))
+
+    for (clip_index, samples), result in zip(short_clips, results):
+        clip = clips[clip_index]
+        clip["language"] = result.language
+        if (
+            result.no_speech_prob > NO_SPEECH_THRESHOLD
+            and result.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            continue
+
+        if (
+            result.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < LOGPROB_THRESHOLD
+        ):
+            response = model.transcribe(
+                samples, task="transcribe", language=result.language, fp16=False
+            )
+            clip["segments"] = response["segments"]
+        else:
+            tokenizer = get_tokenizer(
+                model.is_multilingual,
+                num_languages=model.num_languages,
+                language=result.language,
+                task="transcribe",
+            )
+            clip["segments"] = _split_segments(
+                tokenizer, result.tokens, 0.0, len(samples) / SAMPLE_RATE
+            )
 
-        audio_path = state.audio_path
-        model = whisper.load_model(whisper_model_size)
+    for clip in clips:
+        clip["text"] = "".join(segment["text"] for segment in clip["segments"])
+    return clips
 
-        response = model.transcribe(audio_path, task="transcribe", fp16=False)
+
+def benchmark_batch_transcription(
+    audio_paths: Sequence[str],
+    model_size: str = "base",
+    batch_size: int = 8,
+) -> Dict[str, float]:
+    """
+    Compare clips per minute of per-file `model.transcribe` calls with
+    `transcribe_batch` on the same clips. Audio is decoded, and both paths
+    are warmed up on the first clips, before timing.
+    """
+    audios = [load_audio_buffer(path) for path in audio_paths]
+
+    with use_whisper_model(model_size) as model:
+        # Keep one-off costs (allocator growth, mel filters, tokenizer setup)
+        # out of the timed runs
+        model.transcribe(audios[0].as_float32(), task="transcribe", fp16=False)
+        transcribe_batch(model, audios[:batch_size], batch_size)
+
+        started = time.perf_counter()
+        for audio in audios:
+            model.transcribe(audio.as_float32(), task="transcribe", fp16=False)
+        per_file_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        transcribe_batch(model, audios, batch_size)
+        batched_seconds = time.perf_counter() - started
+
+    return {
+        "clips": len(audios),
+        "per_file_clips_per_minute": 60 * len(audios) / per_file_seconds,
+        "batched_clips_per_minute": 60 * len(audios) / batched_seconds,
+    }
+
+
+class TranscribeAudio(BaseProcessor):
+    """
+    Transcribes audio files using OpenAI's Whisper model.
+    """
+
+    def before_process(self, state: State) -> State:
+        if state.audio is None:
+            self.logger.info("No audio buffer found. Running AudioExtractor...")
+            audio_extractor = AudioExtractor("audio_extractor")
+            state = audio_extractor.process(state)
+        return state
+
+    def extract_segments(self, transcript_segments, first_timestamp=0.0):
+        starts, ends, texts = [], [], []
+        for i, segment in enumerate(transcript_segments):
+            starts.append(segment["start"] if i > 0 else first_timestamp)
+            ends.append(segment["end"])
+            texts.append(str(segment["text"]).strip())
+        return SegmentTable(starts, ends, texts)
+
+    def _with_transcript(self, state: State, response: Dict[str, Any]) -> State:
+        """Store a Whisper response as the state's transcript"""
         transcribed_text = str(response["text"]).strip()
-        first_timestamp = fix_first_speech_timestamp(audio_path)
+        first_timestamp = find_first_speech_timestamp(state.audio)
         transcribed_segments = self.extract_segments(
             response["segments"],
             first_timestamp,
@@ -55,9 +241,8 @@ class TranscribeAudio(BaseProcessor):
             f"({len(transcribed_segments)} segments, {len(transcribed_text)} characters)"
         )
 
-        return State(
-            **{
-                **state.model_dump(),
+        return state.model_copy(
+            update={
                 "context": transcribed_text,
                 "metadata": {
                     **state.metadata,
@@ -66,3 +251,49 @@ class TranscribeAudio(BaseProcessor):
                 },
             }
         )
+
+    def _process_implementation(self, state: State) -> State:
+        whisper_model_size = self.config.whisper_model_size
+        self.logger.info(
+            f"Transcribing audio using Whisper {whisper_model_size} model..."
+        )
+
+        with use_whisper_model(whisper_model_size) as model:
+            response = model.transcribe(
+                state.audio.as_float32(), task="transcribe", fp16=False
+            )
+        return self._with_transcript(state, response)
+
+
+class BatchTranscriber(TranscribeAudio):
+    """
+    Transcribes several short clips together with batched Whisper decoding.
+    `process` still transcribes a single state like `TranscribeAudio`.
+    """
+
+    def process_batch(self, states: List[State]) -> List[State]:
+        """Transcribe every state's audio in shared batches, reporting per state"""
+        with log_context(node=self.node_name):
+            for state in states:
+                state.report_progress(self.node_name, status="started")
+            states = [self.before_process(state) for state in states]
+
+            whisper_model_size = self.config.whisper_model_size
+            self.logger.info(
+                f"Transcribing {len(states)} clips in batches of "
+                f"{self.config.transcribe_batch_size} using Whisper "
+                f"{whisper_model_size} model..."
+            )
+            with use_whisper_model(whisper_model_size) as model:
+                responses = transcribe_batch(
+                    model,
+                    [state.audio for state in states],
+                    self.config.transcribe_batch_size,
+                )
+
+            results = []
+            for state, response in zip(states, responses):
+                state = self.after_process(self._with_transcript(state, response))
+                state.report_progress(self.node_name, status="completed")
+                results.append(state)
+        return results
@@ -1,19 +1,27 @@
 import asyncio
 from asyncio import Semaphore
-
-import nest_asyncio
-from langchain.prompts import PromptTemplate
+from typing import TYPE_CHECKING
 
 from processors.base_processor import BaseProcessor
 from utils import prompt_template
+from utils.event_loop import run_coroutine
+from utils.logging import log_context
+from utils.string import target_script_ratio
+from utils.subtitle import SRTFormatter
+from workflow.segments import SegmentTable, align_segments, changed_ranges
 from workflow.state import State
 
+if TYPE_CHECKING:
+    from langchain.prompts import PromptTemplate
+
 
 class WhisperTranslator(BaseProcessor):
     """Processor for text translation"""
 
     @property
-    def _load_prompt_template(self) -> PromptTemplate:
+    def _load_prompt_template(self) -> "PromptTemplate":
+        from langchain.prompts import PromptTemplate
+
         return PromptTemplate(
             input_variables=["context"],
             template=prompt_template.WHISPER_TRANSLATOR_TEMPLATE,
@@ -30,7 +38,9 @@ class WhisperTranslator(BaseProcessor):
     ):
         async with semaphore:
             self.logger.info(
-                f"[Batch {batch_index}] Starting processing ({len(batch)} segments)"
+                "[Batch %d] Starting processing (%d segments)",
+                batch_index,
+                len(batch),
             )
 
             # Prepare the input text
@@ -39,45 +49,194 @@ class WhisperTranslator(BaseProcessor):
             # Get the prompt ready for LLM
             prompt = self._load_prompt_template.format(context=segment_texts)
 
-            # Process with retries
-            for attempt in range(max_retries):
-                try:
-                    translated_batch = await self._translate_segments(
-                        prompt,
-                        batch,
+            if self.config.draft_translation_enabled:
+                return await self._draft_and_refine_batch(
+                    prompt, batch, batch_index, state, max_retries
+                )
+
+            return await self._translate_with_retries(
+                prompt, batch, batch_index, state, max_retries
+            )
+
+    async def _process_batch_with_progress(
+        self,
+        batch,
+        context,
+        semaphore: Semaphore,
+        batch_index: int,
+        total_batches: int,
+        state: State,
+    ):
+        """Process a batch and report it, with its translated segments, as progress"""
+        with log_context(batch=batch_index):
+            translated_batch = await self._process_batch(
+                batch, context, semaphore, batch_index, state
+            )
+        state.report_progress(
+            self.node_name,
+            status="batch_completed",
+            batch=batch_index,
+            total_batches=total_batches,
+            segments=translated_batch,
+        )
+        return translated_batch
+
+    async def _translate_with_retries(
+        self,
+        prompt,
+        batch,
+        batch_index,
+        state: State,
+        max_retries: int = 5,
+        get_llm=None,
+        usage_key=None,
+    ):
+        """Translate a batch, retrying on errors and segment count mismatches"""
+        for attempt in range(max_retries):
+            try:
+                translated_batch = await self._translate_segments(
+                    prompt,
+                    batch,
+                    batch_index,
+                    attempt,
+                    max_retries,
+                    state,
+                    get_llm,
+                    usage_key,
+                )
+
+                self.logger.info(
+                    "[Batch %d] Successfully processed all segments", batch_index
+                )
+                return translated_batch
+
+            except ValueError as e:
+                if (
+                    "Mismatch in translated batch size" in str(e)
+                    and attempt < max_retries - 1
+                ):
+                    self.logger.warning("[Batch %d] %s. Retrying...", batch_index, e)
+                    await asyncio.sleep(5)
+                    continue
+                raise
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    self.logger.warning(
+                        "[Batch %d] Error on attempt %d: %s. Retrying...",
                         batch_index,
-                        attempt,
-                        max_retries,
-                        state,
+                        attempt + 1,
+                        e,
                     )
+                    await asyncio.sleep(5)
+                    continue
+                self.logger.error(
+                    "[Batch %d] Failed after %d attempts", batch_index, max_retries
+                )
+                raise
+
+    async def _draft_and_refine_batch(
+        self,
+        prompt,
+        batch,
+        batch_index,
+        state: State,
+        max_retries: int = 5,
+        draft_retries: int = 2,
+    ):
+        """
+        Draft the whole batch with the draft model, then send only the flagged
+        segments to the main model for review and correction.
+        """
+        try:
+            draft_batch = await self._translate_with_retries(
+                prompt,
+                batch,
+                batch_index,
+                state,
+                draft_retries,
+                self.config.get_draft_llm_model,
+                f"{self.node_name}_draft",
+            )
+        except Exception as e:
+            self.logger.warning(
+                "[Batch %d] Draft translation failed (%s). Translating batch with %s...",
+                batch_index,
+                e,
+                self.config.llm_model_name,
+            )
+            return await self._translate_with_retries(
+                prompt, batch, batch_index, state, max_retries
+            )
 
-                    self.logger.info(
-                        f"[Batch {batch_index}] Successfully processed all segments"
-                    )
-                    return translated_batch
-
-                except ValueError as e:
-                    if (
-                        "Mismatch in translated batch size" in str(e)
-                        and attempt < max_retries - 1
-                    ):
-                        self.logger.warning(
-                            f"[Batch {batch_index}] {str(e)}. Retrying..."
-                        )
-                        await asyncio.sleep(5)
-                        continue
-                    raise
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        self.logger.warning(
-                            f"[Batch {batch_index}] Error on attempt {attempt + 1}: {str(e)}. Retrying..."
-                        )
-                        await asyncio.sleep(5)
-                        continue
-                    self.logger.error(
-                        f"[Batch {batch_index}] Failed after {max_retries} attempts"
-                    )
-                    raise
+        flagged = self._flag_segments(batch, draft_batch)
+        if not flagged:
+            self.logger.info("[Batch %d] All draft segments accepted", batch_index)
+            return draft_batch
+
+        self.logger.info(
+            "[Batch %d] Refining %d/%d flagged segments with %s",
+            batch_index,
+            len(flagged),
+            len(batch),
+            self.config.llm_model_name,
+        )
+        flagged_batch = [batch[i] for i in flagged]
+        refine_prompt = prompt_template.REFINE_WHISPER_TEMPLATE.format(
+            context=self._prepare_refine_text(
+                flagged_batch, [draft_batch[i] for i in flagged]
+            ),
+            batch_length=len(flagged_batch),
+        )
+        refined_batch = await self._translate_with_retries(
+            refine_prompt, flagged_batch, batch_index, state, max_retries
+        )
+
+        for i, refined_segment in zip(flagged, refined_batch):
+            draft_batch[i] = refined_segment
+        return draft_batch
+
+    def _flag_segments(self, batch, draft_batch):
+        """Return the indices of draft segments that need review"""
+        flagged = []
+        for i, (segment, draft_segment) in enumerate(zip(batch, draft_batch)):
+            reason = self._flag_reason(segment["text"], draft_segment["text"])
+            if reason:
+                self.logger.debug("Flagged segment %d (%s)", i, reason)
+                flagged.append(i)
+        return flagged
+
+    def _flag_reason(self, source_text, draft_text):
+        """Return why a draft translation looks wrong, or None if it looks fine"""
+        source_text = source_text.strip()
+        draft_text = draft_text.strip()
+
+        if not source_text:
+            return None
+        if not draft_text:
+            return "empty"
+        if "SSS" in draft_text:
+            return "delimiter"
+        if (
+            draft_text == source_text
+            or target_script_ratio(draft_text) < self.config.draft_min_target_ratio
+        ):
+            return "untranslated"
+        if len(source_text) >= 10:
+            ratio = len(draft_text) / len(source_text)
+            if not (
+                self.config.draft_min_length_ratio
+                <= ratio
+                <= self.config.draft_max_length_ratio
+            ):
+                return "length_ratio"
+        return None
+
+    def _prepare_refine_text(self, batch, draft_batch):
+        """Pair source and draft texts for review, joined with delimiter"""
+        return "\n[SSS]\n".join(
+            f"EN: {segment['text'].strip()}\nTH: {draft_segment['text'].strip()}"
+            for segment, draft_segment in zip(batch, draft_batch)
+        )
 
     def _prepare_batch_text(self, batch):
         """Extract and join segment texts with delimiter"""
@@ -92,13 +251,17 @@ class WhisperTranslator(BaseProcessor):
         attempt,
         max_retries,
         state: State,
+        get_llm=None,
+        usage_key=None,
     ):
         """Send request to LLM and process the response"""
-        llm = self.config.get_llm_model()
+        llm = (get_llm or self.config.get_llm_model)()
 
-        self.logger.info(
-            f"[Batch {batch_index}] Sending request to LLM "
-            f"(attempt {attempt + 1}/{max_retries})"
+        self.logger.debug(
+            "[Batch %d] Sending request to LLM (attempt %d/%d)",
+            batch_index,
+            attempt + 1,
+            max_retries,
         )
         # Determine the prompt to use based on the attempt number
         if attempt == 0:
@@ -109,12 +272,12 @@ class WhisperTranslator(BaseProcessor):
                 batch_length=len(batch),
             )
 
-        response = llm.invoke(enhanced_prompt)
+        response = await llm.ainvoke(enhanced_prompt)
         translated_segment_texts = str(response.content).strip()
         translated_batch_texts = translated_segment_texts.split("\n[SSS]\n")
 
         # Track token usage
-        self.track_token_usage(state, response)
+        self.track_token_usage(state, response, usage_key)
 
         # Validate response
         if len(translated_batch_texts) != len(batch):
@@ -139,52 +302,107 @@ class WhisperTranslator(BaseProcessor):
         concurrent_batches = self.config.concurrent_batches or 3
         context = state.context or ""
 
-        segments = state.metadata["transcribed_segments"]
-        segment_batches = [
-            segments[i : i + batch_size] for i in range(0, len(segments), batch_size)
+        segments = SegmentTable.from_segments(state.metadata["transcribed_segments"])
+        translated_texts, ranges = self._plan_translation(state, segments)
+
+        # Each batch is a [start, end) range of segments
+        batch_ranges = [
+            (i, min(i + batch_size, end))
+            for start, end in ranges
+            for i in range(start, end, batch_size)
         ]
 
         self.logger.info(
-            f"Processing {len(segment_batches)} batches with max "
-            f"{concurrent_batches} concurrent tasks"
+            "Processing %d batches with max %d concurrent tasks",
+            len(batch_ranges),
+            concurrent_batches,
         )
         max_concurrent = concurrent_batches
 
         semaphore = Semaphore(max_concurrent)
         tasks = [
-            self._process_batch(batch, context, semaphore, idx, state)
-            for idx, batch in enumerate(segment_batches, 1)
+            self._process_batch_with_progress(
+                segments[start:end], context, semaphore, idx, len(batch_ranges), state
+            )
+            for idx, (start, end) in enumerate(batch_ranges, 1)
         ]
         results = await asyncio.gather(*tasks)
-        translated_segments = [
-            item for sublist in results if sublist is not None for item in sublist
-        ]
+
+        # Only fill segments without a translation; context segments keep theirs
+        for (start, _), sublist in zip(batch_ranges, results):
+            for index, item in enumerate(sublist or [], start):
+                if translated_texts[index] is None:
+                    translated_texts[index] = item["text"]
+        translated_segments = segments.with_texts(translated_texts)
 
         self.logger.info("Translation segments completed.")
 
-        return State(
-            **{
-                **state.model_dump(),
+        metadata = {
+            **state.metadata,
+            "translated_segments": translated_segments,
+            # A copy, so in-place edits of transcribed_segments show up as changes
+            "translation_source_segments": segments.copy(),
+        }
+        if self.config.incremental_translation and metadata.get("srt_path"):
+            SRTFormatter().format_and_save(translated_segments, metadata["srt_path"])
+
+        return state.model_copy(
+            update={
                 "context": "Final translated context",
-                "metadata": {
-                    **state.metadata,
-                    "translated_segments": translated_segments,
-                },
+                "metadata": metadata,
             }
         )
 
-    def _process_implementation(self, state: State) -> State:
-        nest_asyncio.apply()
+    def _plan_translation(self, state: State, segments: SegmentTable):
+        """
+        Return the known translated texts (None where a translation is needed)
+        and the `[start, end)` segment ranges to send to the LLM.
+
+        In incremental mode, segments unchanged since the previous translation
+        keep their translation, and only edited segments plus
+        `incremental_context_segments` neighbours on each side are sent.
+        """
+        previous_source = state.metadata.get("translation_source_segments")
+        previous_translation = state.metadata.get("translated_segments")
+        if not (
+            self.config.incremental_translation
+            and previous_source is not None
+            and previous_translation is not None
+        ):
+            return [None] * len(segments), [(0, len(segments))] if segments else []
+
+        previous_source = SegmentTable.from_segments(previous_source)
+        previous_translation = SegmentTable.from_segments(previous_translation)
+        unchanged = align_segments(previous_source, segments)
+
+        translated_texts = [None] * len(segments)
+        for new_index, old_index in unchanged.items():
+            translated_texts[new_index] = previous_translation.texts[old_index]
+
+        changed = [i for i, text in enumerate(translated_texts) if text is None]
+        self.logger.info(
+            "Incremental translation: %d/%d segments changed since the previous "
+            "translation",
+            len(changed),
+            len(segments),
+        )
+        return translated_texts, changed_ranges(
+            changed, len(segments), self.config.incremental_context_segments
+        )
 
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self._process_implementation_async(state))
+    def _process_implementation(self, state: State) -> State:
+        # Runs on the shared loop that owns the cached clients' connection pools,
+        # also when called from a thread with its own running loop (e.g. Jupyter)
+        return run_coroutine(self._process_implementation_async(state))
 
 
 class ContextTranslator(BaseProcessor):
     """Processor for text translation"""
 
     @property
-    def _load_prompt_template(self) -> PromptTemplate:
+    def _load_prompt_template(self) -> "PromptTemplate":
+        from langchain.prompts import PromptTemplate
+
         return PromptTemplate(
             input_variables=["context"],
             template=prompt_template.CONTEXT_TRANSLATOR_TEMPLATE,
@@ -207,9 +425,8 @@ class ContextTranslator(BaseProcessor):
 
         self.logger.info("Translation context completed.")
 
-        return State(
-            **{
-                **state.model_dump(),
+        return state.model_copy(
+            update={
                 "context": translated_context,
                 "metadata": {
                     **state.metadata,
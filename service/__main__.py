@@ -0,0 +1,24 @@
+from config.app_config import AppConfig
+from service.http_api import PipelineHTTPServer
+from service.pipeline_service import PipelineService
+
+
+def main() -> None:
+    config = AppConfig()
+    service = PipelineService().start()
+    server = PipelineHTTPServer((config.service_host, config.service_port), service)
+    service.logger.info(
+        f"Listening on http://{config.service_host}:{config.service_port}"
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
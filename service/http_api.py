@@ -0,0 +1,110 @@
+import json
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from service.job_store import COMPLETED
+from service.pipeline_service import PipelineService, QueueFullError
+
+JOB_ROUTE = re.compile(r"^/jobs/(?P<job_id>[0-9a-f]+)(?P<action>/events|/srt)?$")
+
+
+class PipelineRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the pipeline service:
+
+    - `POST /jobs` with `{"video_path": ..., "workflow": ...}` queues a job
+    - `GET /jobs` lists recent jobs, `GET /jobs/<id>` returns one job
+    - `GET /jobs/<id>/events` streams progress as newline-delimited JSON,
+      including translated segments as each batch completes
+    - `GET /jobs/<id>/srt` returns the finished subtitles
+    """
+
+    server: "PipelineHTTPServer"
+
+    def do_POST(self) -> None:
+        if self.path != "/jobs":
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": "Not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.service.submit(
+                body.get("video_path", ""),
+                body.get("workflow", "transcribe_translate"),
+            )
+        except (ValueError, AttributeError) as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        except QueueFullError as e:
+            return self._send_json(HTTPStatus.TOO_MANY_REQUESTS, {"error": str(e)})
+
+        self._send_json(HTTPStatus.ACCEPTED, job)
+
+    def do_GET(self) -> None:
+        if self.path == "/jobs":
+            return self._send_json(HTTPStatus.OK, self.server.service.list_jobs())
+
+        match = JOB_ROUTE.match(self.path)
+        job = self.server.service.get_job(match["job_id"]) if match else None
+        if job is None:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": "Job not found"})
+
+        if match["action"] == "/events":
+            return self._stream_events(job["id"])
+        if match["action"] == "/srt":
+            return self._send_srt(job)
+        self._send_json(HTTPStatus.OK, job)
+
+    def _stream_events(self, job_id: str) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        try:
+            for event in self.server.service.follow(job_id, timeout=15):
+                # Blank lines are keep-alives
+                line = json.dumps(event, ensure_ascii=False) if event else ""
+                self.wfile.write(line.encode("utf-8") + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send_srt(self, job: dict) -> None:
+        if job["status"] != COMPLETED:
+            return self._send_json(
+                HTTPStatus.CONFLICT, {"error": f"Job is {job['status']}"}
+            )
+
+        try:
+            with open(job["result"]["srt_path"], "rb") as srt_file:
+                body = srt_file.read()
+        except FileNotFoundError:
+            return self._send_json(
+                HTTPStatus.GONE, {"error": "Subtitle file no longer exists"}
+            )
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-subrip; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        self.server.service.logger.debug(format, *args)
+
+
+class PipelineHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, service: PipelineService) -> None:
+        super().__init__(address, PipelineRequestHandler)
+        self.service = service
@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+QUEUED = "queued"
+TRANSCRIBING = "transcribing"
+TRANSLATING = "translating"
+COMPLETED = "completed"
+FAILED = "failed"
+
+FINISHED_STATUSES = (COMPLETED, FAILED)
+
+
+class JobStore:
+    """
+    SQLite-backed store for pipeline jobs, so submitted work survives restarts.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    workflow TEXT NOT NULL,
+                    video_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def create(self, workflow: str, video_path: str) -> Dict[str, Any]:
+        """Insert a new queued job and return it"""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, workflow, video_path, status, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, workflow, video_path, QUEUED, now, now),
+            )
+        return self.get(job_id)
+
+    def delete(self, job_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update job columns; `result` is stored as JSON"""
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"UPDATE jobs SET {columns} WHERE id = ?",
+                (*fields.values(), job_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        """Return jobs that were queued or running, oldest first"""
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT * FROM jobs WHERE status NOT IN ({placeholders}) "
+                "ORDER BY created_at",
+                FINISHED_STATUSES,
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
@@ -0,0 +1,414 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from config.app_config import AppConfig
+from processors.audio_extractor import AudioExtractor
+from processors.transcriber import BatchTranscriber, use_whisper_model
+from service.job_store import COMPLETED, FAILED, TRANSCRIBING, TRANSLATING, JobStore
+from utils.logging import log_context, setup_logger
+from utils.subtitle import SRTFormatter
+from workflow.state import State
+from workflow.workflow_factory import WorkflowFactory
+
+# LLM stage of each workflow; every workflow starts with the shared ASR stage
+WORKFLOWS: Dict[str, Callable[[], Any]] = {
+    "transcribe_translate": WorkflowFactory.translate_workflow,
+    "transcribe_summarize_translate": WorkflowFactory.summarize_translate_workflow,
+}
+
+# How often blocked queue operations check whether the service is stopping
+STOP_POLL_SECONDS = 0.5
+
+
+class QueueFullError(Exception):
+    """Raised when the service cannot accept more jobs"""
+
+
+class JobProgress:
+    """Ordered progress events of one job that any number of readers can follow"""
+
+    def __init__(self) -> None:
+        self._events: List[Dict[str, Any]] = []
+        self._finished = False
+        self._condition = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def publish(self, event: Dict[str, Any], finished: bool = False) -> None:
+        with self._condition:
+            self._events.append(event)
+            self._finished = self._finished or finished
+            self._condition.notify_all()
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Return the events published so far without waiting"""
+        with self._condition:
+            return list(self._events)
+
+    def follow(self, timeout: Optional[float] = None) -> Iterator[Optional[Dict]]:
+        """
+        Yield events from the beginning until the job finishes. Yields None when
+        `timeout` passes without new events, so callers can send keep-alives.
+        """
+        index = 0
+        while True:
+            with self._condition:
+                if index >= len(self._events) and not self._finished:
+                    self._condition.wait(timeout)
+                events = self._events[index:]
+                finished = self._finished
+
+            index += len(events)
+            yield from events
+
+            if finished:
+                return
+            if not events:
+                yield None
+
+
+class PipelineService:
+    """
+    Long-running pipeline service that keeps compiled workflows, the Whisper
+    model and LLM clients warm across jobs.
+
+    Jobs are persisted in a `JobStore` and flow through two bounded queues:
+    the ASR stage (audio extraction and transcription, CPU-bound) and the LLM
+    stage (summarization and translation, I/O-bound), each served by its own
+    executor. Submissions are rejected with `QueueFullError` when the ASR queue
+    is full, and a full LLM queue blocks the ASR workers. ASR workers share one
+    Whisper model and take turns decoding with it, so `asr_workers` > 1 only
+    overlaps audio extraction with transcription. Remote inputs are
+    prefetched into the media cache as soon as they are queued.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        asr_workers: Optional[int] = None,
+        llm_workers: Optional[int] = None,
+        max_tracked_jobs: int = 256,
+    ) -> None:
+        self.config = AppConfig()
+        self.logger = setup_logger(f"{self.__class__.__name__}")
+        self.store = JobStore(db_path or self.config.service_db_path)
+        self.output_dir = output_dir or self.config.service_output_dir
+        self.asr_workers = asr_workers or self.config.asr_workers
+        self.llm_workers = llm_workers or self.config.llm_workers
+        self.max_tracked_jobs = max_tracked_jobs
+
+        queue_size = queue_size or self.config.service_queue_size
+        self.asr_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.llm_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+
+        self._asr_graph = WorkflowFactory.transcribe_workflow()
+        self._llm_graphs = {name: factory() for name, factory in WORKFLOWS.items()}
+        self._audio_extractor = AudioExtractor("audio_extractor")
+        self._batch_transcriber = BatchTranscriber("transcriber")
+        self._srt_formatter = SRTFormatter()
+        self._progress: "OrderedDict[str, JobProgress]" = OrderedDict()
+        self._progress_lock = threading.Lock()
+        self._asr_executor: Optional[ThreadPoolExecutor] = None
+        self._llm_executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> "PipelineService":
+        """Warm up models and start the stage workers"""
+        unfinished_jobs = self.store.unfinished()
+
+        self._asr_executor = ThreadPoolExecutor(
+            max_workers=self.asr_workers, thread_name_prefix="asr"
+        )
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=self.llm_workers, thread_name_prefix="llm"
+        )
+
+        self._asr_executor.submit(self._warm_up_whisper)
+        if self.config.llm_model_name and self.config.llm_model_provider:
+            self.config.get_llm_model()
+
+        for _ in range(self.asr_workers):
+            self._asr_executor.submit(self._asr_worker)
+        for _ in range(self.llm_workers):
+            self._llm_executor.submit(self._worker, self.llm_queue, self._run_llm)
+
+        threading.Thread(
+            target=self._resume_jobs, args=(unfinished_jobs,), daemon=True
+        ).start()
+
+        self.logger.info(
+            f"Pipeline service started ({self.asr_workers} ASR workers, "
+            f"{self.llm_workers} LLM workers)"
+        )
+        return self
+
+    def _warm_up_whisper(self) -> None:
+        with use_whisper_model(self.config.whisper_model_size):
+            pass
+
+    def stop(self) -> None:
+        """
+        Stop the workers after the jobs they are running finish. Jobs still
+        queued stay unfinished in the store and are resumed by the next start.
+        """
+        self._stopping.set()
+        if self._asr_executor:
+            self._asr_executor.shutdown(wait=True)
+        if self._llm_executor:
+            self._llm_executor.shutdown(wait=True)
+        self._audio_extractor.close()
+        self.store.close()
+        self.logger.info("Pipeline service stopped")
+
+    def submit(
+        self, video_path: str, workflow: str = "transcribe_translate"
+    ) -> Dict[str, Any]:
+        """Queue a new job, or raise `QueueFullError` if the service is saturated"""
+        if workflow not in WORKFLOWS:
+            raise ValueError(
+                f"Unknown workflow '{workflow}'. Expected one of: {', '.join(WORKFLOWS)}"
+            )
+        if not video_path:
+            raise ValueError("video_path is required")
+
+        job = self.store.create(workflow, video_path)
+        self._track(job["id"])
+        try:
+            self.asr_queue.put_nowait((job["id"], workflow, video_path))
+        except queue.Full:
+            self.store.delete(job["id"])
+            self._untrack(job["id"])
+            raise QueueFullError("Job queue is full, retry later")
+
+        # Remote inputs start downloading while earlier jobs are transcribed
+        self._audio_extractor.prefetch(video_path)
+        self.logger.info(f"Job {job['id']} queued ({workflow}): {video_path}")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return self.store.list(limit)
+
+    def follow(
+        self, job_id: str, timeout: Optional[float] = None
+    ) -> Iterator[Optional[Dict]]:
+        """Yield progress events of a job until it finishes"""
+        with self._progress_lock:
+            progress = self._progress.get(job_id)
+        if progress is not None:
+            yield from progress.follow(timeout)
+            return
+
+        job = self.store.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        yield {"job_id": job_id, "status": job["status"], "stage": job["stage"]}
+
+    def progress(self, job_id: str) -> List[Dict[str, Any]]:
+        """Return the progress events of a job published so far, without blocking"""
+        with self._progress_lock:
+            progress = self._progress.get(job_id)
+        return progress.events() if progress is not None else []
+
+    def _get(self, jobs: queue.Queue) -> Optional[Tuple[Any, ...]]:
+        """Wait for the next queued item, or return None once the service stops"""
+        while not self._stopping.is_set():
+            try:
+                return jobs.get(timeout=STOP_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return None
+
+    def _put(self, jobs: queue.Queue, item: Tuple[Any, ...]) -> bool:
+        """Queue an item, waiting for space; returns False if the service stops"""
+        while not self._stopping.is_set():
+            try:
+                jobs.put(item, timeout=STOP_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self, jobs: queue.Queue, run: Callable[..., None]) -> None:
+        while True:
+            item = self._get(jobs)
+            if item is None:
+                return
+            # Every queued item starts with its job ID
+            with log_context(job_id=item[0]):
+                run(*item)
+
+    def _asr_worker(self) -> None:
+        """
+        Take jobs already waiting in the ASR queue together, up to
+        `transcribe_batch_size`, so short clips share batched Whisper passes.
+        """
+        while True:
+            item = self._get(self.asr_queue)
+            if item is None:
+                return
+
+            items = [item]
+            while len(items) < self.config.transcribe_batch_size:
+                try:
+                    items.append(self.asr_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if len(items) == 1:
+                with log_context(job_id=items[0][0]):
+                    self._run_asr(*items[0])
+            else:
+                self._run_asr_batch(items)
+
+    def _run_asr(self, job_id: str, workflow: str, video_path: str) -> None:
+        self.store.update(job_id, status=TRANSCRIBING)
+        try:
+            state = State(
+                video_path=video_path, on_progress=self._progress_callback(job_id)
+            )
+            state = State(**self._asr_graph.invoke(state))
+        except Exception as e:
+            self._fail(job_id, e)
+            return
+
+        self._queue_llm(job_id, workflow, state)
+
+    def _run_asr_batch(self, items: List[Tuple[str, str, str]]) -> None:
+        """
+        Extract audio for each job, then transcribe clips up to
+        `batch_max_clip_seconds` in shared batches and longer ones one by one.
+        """
+        short_jobs, long_jobs = [], []
+        for job_id, workflow, video_path in items:
+            with log_context(job_id=job_id):
+                self.store.update(job_id, status=TRANSCRIBING)
+                try:
+                    state = self._audio_extractor.process(
+                        State(
+                            video_path=video_path,
+                            on_progress=self._progress_callback(job_id),
+                        )
+                    )
+                except Exception as e:
+                    self._fail(job_id, e)
+                    continue
+
+            if state.audio.duration <= self.config.batch_max_clip_seconds:
+                short_jobs.append((job_id, workflow, state))
+            else:
+                long_jobs.append((job_id, workflow, state))
+
+        for job_id, workflow, state in long_jobs:
+            with log_context(job_id=job_id):
+                try:
+                    state = self._batch_transcriber.process(state)
+                except Exception as e:
+                    self._fail(job_id, e)
+                    continue
+            self._queue_llm(job_id, workflow, state)
+
+        if not short_jobs:
+            return
+        try:
+            states = self._batch_transcriber.process_batch(
+                [state for _, _, state in short_jobs]
+            )
+        except Exception as e:
+            for job_id, _, _ in short_jobs:
+                self._fail(job_id, e)
+            return
+        for (job_id, workflow, _), state in zip(short_jobs, states):
+            self._queue_llm(job_id, workflow, state)
+
+    def _queue_llm(self, job_id: str, workflow: str, state: State) -> None:
+        # The audio buffer is not needed by the LLM stage
+        item = (job_id, workflow, state.model_copy(update={"audio": None}))
+        if not self._put(self.llm_queue, item):
+            self.logger.info(f"Service stopping, job {job_id} resumes on next start")
+
+    def _progress_callback(self, job_id: str) -> Callable[[str, Dict[str, Any]], None]:
+        return lambda stage, progress: self._publish(job_id, stage, progress)
+
+    def _run_llm(self, job_id: str, workflow: str, state: State) -> None:
+        self.store.update(job_id, status=TRANSLATING)
+        srt_path = os.path.join(self.output_dir, f"{job_id}.srt")
+        # Recorded so an incremental re-translation of this state rewrites the SRT
+        state = state.model_copy(
+            update={"metadata": {**state.metadata, "srt_path": srt_path}}
+        )
+        try:
+            state = State(**self._llm_graphs[workflow].invoke(state))
+            self._srt_formatter.format_and_save(
+                state.metadata["translated_segments"], srt_path
+            )
+        except Exception as e:
+            self._fail(job_id, e)
+            return
+
+        result = {
+            "srt_path": srt_path,
+            "segments": len(state.metadata["translated_segments"]),
+            "token_usage": {
+                name: usage.model_dump() for name, usage in state.token_usage.items()
+            },
+        }
+        self.store.update(job_id, status=COMPLETED, stage=None, result=result)
+        self._publish(job_id, None, {"status": COMPLETED, "result": result}, True)
+        self.logger.info(f"Job {job_id} completed: {srt_path}")
+
+    def _fail(self, job_id: str, error: Exception) -> None:
+        self.logger.error(f"Job {job_id} failed: {str(error)}")
+        self.store.update(job_id, status=FAILED, error=str(error))
+        self._publish(job_id, None, {"status": FAILED, "error": str(error)}, True)
+
+    def _publish(
+        self,
+        job_id: str,
+        stage: Optional[str],
+        progress: Dict[str, Any],
+        finished: bool = False,
+    ) -> None:
+        if progress.get("status") == "started":
+            self.store.update(job_id, stage=stage)
+        with self._progress_lock:
+            job_progress = self._progress.get(job_id)
+        if job_progress is not None:
+            job_progress.publish(
+                {"job_id": job_id, "stage": stage, **progress}, finished
+            )
+
+    def _track(self, job_id: str) -> None:
+        with self._progress_lock:
+            self._progress[job_id] = JobProgress()
+            # Forget the oldest finished jobs; their final state is in the store
+            for tracked_id in list(self._progress):
+                if len(self._progress) <= self.max_tracked_jobs:
+                    break
+                if self._progress[tracked_id].finished:
+                    del self._progress[tracked_id]
+
+    def _untrack(self, job_id: str) -> None:
+        with self._progress_lock:
+            self._progress.pop(job_id, None)
+
+    def _resume_jobs(self, jobs: List[Dict[str, Any]]) -> None:
+        """Re-queue jobs left queued or running by a previous service process"""
+        for job in jobs:
+            self.logger.info(f"Resuming job {job['id']}")
+            self._track(job["id"])
+            if not self._put(
+                self.asr_queue, (job["id"], job["workflow"], job["video_path"])
+            ):
+                return
+            self._audio_extractor.prefetch(job["video_path"])
@@ -0,0 +1,162 @@
+import os
+import tempfile
+
+import streamlit as st
+
+from config.app_config import AppConfig
+from service.job_store import COMPLETED, FAILED
+from service.pipeline_service import WORKFLOWS, PipelineService, QueueFullError
+from utils.subtitle import SRTFormatter
+
+UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "llm-asr-uploads")
+
+STAGE_LABELS = {
+    "audio_extractor": "Extract audio",
+    "transcriber": "Transcribe",
+    "summarizer": "Summarize",
+    "whisper_translate": "Translate",
+}
+
+
+@st.cache_resource
+def get_service() -> PipelineService:
+    """
+    One pipeline service per Streamlit server process, shared by all sessions.
+    It runs jobs on its own executors and keeps the Whisper model and LLM
+    clients warm, so script reruns never wait on processing. Its jobs live in
+    their own database, so a `python -m service` process started from the
+    same directory never resumes them too.
+    """
+    return PipelineService(db_path=AppConfig().streamlit_db_path).start()
+
+
+def save_upload(uploaded_file) -> str:
+    """
+    Save an upload under a unique name so sessions uploading files with the
+    same name never overwrite each other's queued input. The original name is
+    kept as a suffix for the extension and the download file name.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(
+        prefix="upload-", suffix=f"-{uploaded_file.name}", dir=UPLOAD_DIR
+    )
+    with os.fdopen(fd, "wb") as f:
+        f.write(uploaded_file.getbuffer())
+    return path
+
+
+def original_name(video_path: str) -> str:
+    """Return the name a file was uploaded with, or the basename of a path/URL"""
+    name = os.path.basename(video_path)
+    if os.path.dirname(video_path) == UPLOAD_DIR:
+        # upload-<random>-<original name>
+        return name.split("-", 2)[-1]
+    return name
+
+
+def submit_form(service: PipelineService) -> None:
+    with st.form("submit", clear_on_submit=True):
+        uploaded_file = st.file_uploader("Video or audio file")
+        url = st.text_input("...or a YouTube / media URL")
+        workflow = st.selectbox("Workflow", list(WORKFLOWS))
+        submitted = st.form_submit_button("Start")
+
+    if not submitted:
+        return
+    if not uploaded_file and not url:
+        st.warning("Upload a file or enter a URL.")
+        return
+
+    video_path = save_upload(uploaded_file) if uploaded_file else url.strip()
+    try:
+        job = service.submit(video_path, workflow)
+    except QueueFullError as e:
+        st.error(str(e))
+        return
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    st.session_state.setdefault("job_ids", []).insert(0, job["id"])
+
+
+def render_job(service: PipelineService, job_id: str) -> None:
+    job = service.get_job(job_id)
+    if job is None:
+        return
+
+    events = service.progress(job_id)
+    with st.container(border=True):
+        st.markdown(f"**{original_name(job['video_path'])}** · `{job['status']}`")
+
+        stage_status = {}
+        batches = {}
+        total_batches = 0
+        partial_segments = []
+        for event in events:
+            if event.get("stage") in STAGE_LABELS and event["status"] in (
+                "started",
+                "completed",
+            ):
+                stage_status[event["stage"]] = event["status"]
+            if event["status"] == "batch_completed":
+                batches[event["batch"]] = event["segments"]
+                total_batches = event["total_batches"]
+
+        for stage, label in STAGE_LABELS.items():
+            if stage in stage_status:
+                icon = "✅" if stage_status[stage] == "completed" else "⏳"
+                st.write(f"{icon} {label}")
+
+        if total_batches:
+            st.progress(
+                len(batches) / total_batches,
+                text=f"Translated batches: {len(batches)}/{total_batches}",
+            )
+            for batch_index in sorted(batches):
+                partial_segments.extend(batches[batch_index])
+
+        if job["status"] == FAILED:
+            st.error(job["error"])
+        elif job["status"] == COMPLETED:
+            srt_path = job["result"]["srt_path"]
+            try:
+                with open(srt_path, "rb") as srt_file:
+                    srt = srt_file.read()
+            except FileNotFoundError:
+                st.warning(f"Subtitle file no longer exists: {srt_path}")
+                return
+            st.download_button(
+                "Download SRT",
+                srt,
+                file_name=os.path.splitext(original_name(job["video_path"]))[0]
+                + ".srt",
+                mime="application/x-subrip",
+                key=f"download-{job_id}",
+            )
+        elif partial_segments:
+            with st.expander("Partial subtitles"):
+                st.code(SRTFormatter().format(partial_segments), language=None)
+
+
+@st.fragment(run_every=2)
+def render_jobs(service: PipelineService) -> None:
+    """Re-render only the job list every few seconds; processing runs elsewhere"""
+    for job_id in st.session_state.get("job_ids", []):
+        render_job(service, job_id)
+
+
+def main() -> None:
+    st.set_page_config(page_title="LLM ASR Translation")
+    st.title("LLM ASR Translation")
+    st.caption(
+        f"Whisper `{AppConfig().whisper_model_size}` · "
+        f"LLM `{AppConfig().llm_model_name or 'not set'}`"
+    )
+
+    service = get_service()
+    submit_form(service)
+    render_jobs(service)
+
+
+main()
@@ -0,0 +1,159 @@
+import os
+import pathlib
+import re
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.acquisition import MediaAcquirer
+
+BODY = bytes(range(256)) * 64
+
+
+class RangeHandler(SimpleHTTPRequestHandler):
+    """Serves `BODY`, honouring `Range: bytes=N-` with a 206 response"""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("Range"))
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range") or "")
+        offset = int(match.group(1)) if match else 0
+        if offset >= len(BODY):
+            self.send_response(416)
+            self.end_headers()
+            return
+
+        self.send_response(206 if match else 200)
+        self.send_header("Content-Length", str(len(BODY) - offset))
+        self.end_headers()
+        self.wfile.write(BODY[offset:])
+
+    def log_message(self, *args):
+        pass
+
+
+class IgnoreRangeHandler(RangeHandler):
+    """Always sends the whole body with a 200, like `SimpleHTTPRequestHandler`"""
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("Range"))
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+
+def serve(handler):
+    handler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/clip.mp4"
+
+
+@pytest.fixture
+def range_server():
+    server, url = serve(RangeHandler)
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def ignore_range_server():
+    server, url = serve(IgnoreRangeHandler)
+    yield url
+    server.shutdown()
+
+
+def write_part_file(acquirer, url, size):
+    os.makedirs(acquirer.cache_dir, exist_ok=True)
+    part_path = os.path.join(acquirer.cache_dir, acquirer.cache_key(url) + ".mp4.part")
+    with open(part_path, "wb") as f:
+        f.write(BODY[:size])
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_cache_dir_is_created_on_first_download(tmp_path, range_server):
+    acquirer = MediaAcquirer(str(tmp_path / "cache"))
+    assert not os.path.exists(acquirer.cache_dir)
+
+    acquirer.acquire(range_server)
+    assert os.path.isdir(acquirer.cache_dir)
+
+
+def test_cache_hit_skips_download(tmp_path, range_server):
+    acquirer = MediaAcquirer(str(tmp_path))
+
+    first = acquirer.acquire(range_server)
+    second = MediaAcquirer(str(tmp_path)).acquire(range_server)
+
+    assert first == second
+    assert read(first) == BODY
+    assert RangeHandler.requests == [None]
+
+
+def test_resumes_partial_download(tmp_path, range_server):
+    acquirer = MediaAcquirer(str(tmp_path))
+    write_part_file(acquirer, range_server, 1000)
+
+    path = acquirer.acquire(range_server)
+
+    assert read(path) == BODY
+    assert RangeHandler.requests == ["bytes=1000-"]
+    assert not os.path.exists(path + ".part")
+
+
+def test_complete_partial_download_is_kept(tmp_path, range_server):
+    acquirer = MediaAcquirer(str(tmp_path))
+    write_part_file(acquirer, range_server, len(BODY))
+
+    path = acquirer.acquire(range_server)
+
+    assert read(path) == BODY
+    assert RangeHandler.requests == [f"bytes={len(BODY)}-"]
+
+
+def test_restarts_when_server_ignores_range(tmp_path, ignore_range_server):
+    acquirer = MediaAcquirer(str(tmp_path))
+    write_part_file(acquirer, ignore_range_server, 1000)
+
+    path = acquirer.acquire(ignore_range_server)
+
+    assert read(path) == BODY
+    assert IgnoreRangeHandler.requests == ["bytes=1000-"]
+
+
+def test_file_url_is_cached(tmp_path):
+    source = tmp_path / "source.mp4"
+    source.write_bytes(BODY)
+    url = pathlib.Path(source).as_uri()
+
+    path = MediaAcquirer(str(tmp_path / "cache")).acquire(url)
+
+    assert read(path) == BODY
+    assert os.path.dirname(path) == str(tmp_path / "cache")
+
+
+def test_local_path_is_returned_unchanged(tmp_path):
+    acquirer = MediaAcquirer(str(tmp_path / "cache"))
+
+    assert acquirer.acquire("/videos/clip.mp4") == "/videos/clip.mp4"
+    assert acquirer.prefetch("/videos/clip.mp4") is None
+    assert not os.path.exists(acquirer.cache_dir)
+
+
+def test_prefetch_then_acquire_downloads_once(tmp_path, range_server):
+    prefetcher = MediaAcquirer(str(tmp_path))
+    future = prefetcher.prefetch(range_server)
+
+    path = MediaAcquirer(str(tmp_path)).acquire(range_server)
+
+    assert future.result() == path
+    assert read(path) == BODY
+    assert RangeHandler.requests == [None]
+    prefetcher.close()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from utils.audio_analysis import analyze_audio, select_preset
+from utils.process_audio import SAMPLE_RATE, AudioBuffer
+
+
+def make_audio(tone_amplitude, noise_std, seconds=4.0, seed=0):
+    """Half-second 300 Hz tone bursts separated by gaps, over white noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    bursts = (t % 1.0) < 0.5
+    signal = tone_amplitude * np.sin(2 * np.pi * 300 * t) * bursts
+    signal = signal + rng.normal(0, noise_std, len(t))
+    samples = np.clip(signal * 32768, -32768, 32767).astype(np.int16)
+    return AudioBuffer(samples)
+
+
+def test_analysis_measures_snr_and_loudness():
+    analysis = analyze_audio(make_audio(0.2, 1e-4))
+
+    assert analysis["snr_db"] > 40
+    assert -30 < analysis["loudness_db"] < -14
+    assert analysis["clipping_ratio"] == 0.0
+
+
+def test_analysis_detects_clipping():
+    analysis = analyze_audio(make_audio(2.0, 1e-4))
+
+    assert analysis["clipping_ratio"] > 0.1
+    assert analysis["peak_db"] == pytest.approx(0.0, abs=0.01)
+
+
+def test_analysis_only_reads_a_sample():
+    audio = make_audio(0.2, 1e-4, seconds=20.0)
+
+    full = analyze_audio(audio, sample_seconds=60.0)
+    sampled = analyze_audio(audio, sample_seconds=3.0)
+
+    assert sampled["snr_db"] == pytest.approx(full["snr_db"], abs=3.0)
+
+
+@pytest.mark.parametrize(
+    "tone_amplitude, noise_std, preset",
+    [
+        (0.2, 1e-4, "clean"),
+        (0.2, 0.05, "denoise"),
+        (0.01, 1e-4, "normalize"),
+        (2.0, 1e-4, "normalize"),
+        (0.01, 0.003, "full"),
+    ],
+)
+def test_select_preset(tone_amplitude, noise_std, preset):
+    assert select_preset(analyze_audio(make_audio(tone_amplitude, noise_std))) == preset
+
+
+def test_silent_audio_is_clean():
+    silent = AudioBuffer(np.zeros(2 * SAMPLE_RATE, dtype=np.int16))
+
+    assert select_preset(analyze_audio(silent)) == "clean"
+
+
+def test_empty_audio_is_clean():
+    empty = AudioBuffer(np.zeros(0, dtype=np.int16))
+
+    assert select_preset(analyze_audio(empty)) == "clean"
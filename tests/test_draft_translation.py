@@ -0,0 +1,61 @@
+import pytest
+
+from processors.translator import WhisperTranslator
+from utils.string import target_script_ratio
+
+
+@pytest.fixture
+def translator():
+    translator = WhisperTranslator("translator")
+    translator.config.draft_min_length_ratio = 0.3
+    translator.config.draft_max_length_ratio = 3.0
+    translator.config.draft_min_target_ratio = 0.2
+    return translator
+
+
+def test_target_script_ratio():
+    assert target_script_ratio("สวัสดีครับ") == 1.0
+    assert target_script_ratio("hello") == 0.0
+    # Thai vowel and tone marks are not letters: 4 Thai letters, 2 Latin
+    assert target_script_ratio("สวัสดี hi") == pytest.approx(4 / 6)
+    # Digits and punctuation are not letters
+    assert target_script_ratio("42, !") == 1.0
+    assert target_script_ratio("") == 1.0
+
+
+def test_target_script_ratio_with_custom_range():
+    assert target_script_ratio("abc", "a", "b") == pytest.approx(2 / 3)
+
+
+@pytest.mark.parametrize(
+    "source, draft, reason",
+    [
+        ("Hello there, how are you?", "สวัสดีครับ คุณสบายดีไหม", None),
+        ("", "อะไรก็ได้", None),
+        ("Hello there", "  ", "empty"),
+        ("Hello there", "สวัสดี [SSS] ครับ", "delimiter"),
+        ("Hello there", "Hello there", "untranslated"),
+        ("Machine learning models", "Machine learning models ครับ", "untranslated"),
+        ("This sentence is fairly long", "ดี", "length_ratio"),
+        ("Good morning", "สวัสดีตอนเช้าครับ" * 3, "length_ratio"),
+        # Short sources skip the length check
+        ("Hi", "สวัสดีตอนเช้าครับ", None),
+    ],
+)
+def test_flag_reason(translator, source, draft, reason):
+    assert translator._flag_reason(source, draft) == reason
+
+
+def test_flag_reason_uses_configured_thresholds(translator):
+    source = "This sentence is fairly long"
+    draft = "ดี"
+    translator.config.draft_min_length_ratio = 0.0
+
+    assert translator._flag_reason(source, draft) is None
+
+
+def test_flag_segments_returns_flagged_indices(translator):
+    batch = [{"text": "Hello there"}, {"text": "Good evening"}, {"text": "Bye"}]
+    drafts = [{"text": "สวัสดีครับ"}, {"text": "Good evening"}, {"text": ""}]
+
+    assert translator._flag_segments(batch, drafts) == [1, 2]
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy dependencies that must only load when a node that needs them runs
+HEAVY_MODULES = ("whisper", "torch", "yt_dlp", "pythainlp", "langgraph")
+IMPORT_BUDGET_SECONDS = 1.0
+
+SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import workflow.workflow_factory
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def test_workflow_factory_import_is_light():
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["loaded"] == []
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS
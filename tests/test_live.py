@@ -0,0 +1,169 @@
+import time
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage
+
+import live.captioner
+from config.app_config import AppConfig
+from live.captioner import Cue, CueWriter, LiveCaptioner
+from live.segmenter import UtteranceSegmenter
+
+FRAME_SAMPLES = 480  # 30 ms at 16 kHz
+SPEECH = np.full(FRAME_SAMPLES, 1000, dtype=np.int16).tobytes()
+SILENCE = np.zeros(FRAME_SAMPLES, dtype=np.int16).tobytes()
+
+
+class FakeVad:
+    """Treats any non-zero frame as speech"""
+
+    def is_speech(self, frame, sample_rate):
+        return any(frame)
+
+
+def frames(pattern, received_at=100.0):
+    """`(frame, stream_time, wall_time)` tuples for a string of S/. frames"""
+    return [
+        (SPEECH if char == "S" else SILENCE, i * 0.03, received_at + i * 0.03)
+        for i, char in enumerate(pattern)
+    ]
+
+
+def segmenter(**kwargs):
+    segmenter = UtteranceSegmenter(padding_ms=90, trigger_ratio=0.5, **kwargs)
+    segmenter.vad = FakeVad()
+    return segmenter
+
+
+def test_segmenter_splits_on_silence():
+    utterances = list(segmenter().segment(frames("..SSSSSS....SSSS....")))
+
+    # Each utterance keeps one leading frame of padding and ends once two of
+    # the last three frames are silent
+    assert len(utterances) == 2
+    first, second = utterances
+    assert first.start == pytest.approx(0.03)
+    assert first.end == pytest.approx(0.30)
+    assert first.received_at == pytest.approx(100.27)
+    assert len(first.audio) == 9 * FRAME_SAMPLES
+    assert second.start == pytest.approx(0.33)
+    assert second.end == pytest.approx(0.54)
+
+
+def test_segmenter_cuts_long_utterances():
+    utterances = list(segmenter(max_duration=0.3).segment(frames("S" * 25)))
+
+    assert len(utterances) == 3
+    assert all(u.end - u.start <= 0.3 + 1e-9 for u in utterances)
+
+
+def test_segmenter_flushes_trailing_speech():
+    utterances = list(segmenter().segment(frames("..SSSS")))
+
+    assert len(utterances) == 1
+    assert utterances[0].end == pytest.approx(0.18)
+
+
+def test_segmenter_ignores_silence():
+    assert list(segmenter().segment(frames("." * 50))) == []
+
+
+def test_cue_writer_appends_srt(tmp_path):
+    path = tmp_path / "captions.srt"
+    writer = CueWriter("srt", str(path))
+    writer.write(Cue(1, 0.0, 1.5, "สวัสดี", "Hello"))
+    writer.write(Cue(2, 61.25, 62.0, "ครับ", "there"))
+
+    assert path.read_text(encoding="utf-8") == (
+        "1\n00:00:00,000 --> 00:00:01,500\nสวัสดี\n\n"
+        "2\n00:01:01,250 --> 00:01:02,000\nครับ\n\n"
+    )
+
+
+def test_cue_writer_rolling_vtt_keeps_latest_cues(tmp_path):
+    path = tmp_path / "captions.vtt"
+    writer = CueWriter("vtt", str(path), max_cues=2)
+    for index in range(1, 4):
+        writer.write(Cue(index, index, index + 0.5, f"cue {index}", ""))
+
+    assert path.read_text(encoding="utf-8") == (
+        "WEBVTT\n\n"
+        "2\n00:00:02.000 --> 00:00:02.500\ncue 2\n\n"
+        "3\n00:00:03.000 --> 00:00:03.500\ncue 3\n\n"
+    )
+    assert not (tmp_path / "captions.vtt.tmp").exists()
+
+
+def test_cue_writer_writes_to_stdout(capsys):
+    CueWriter("vtt").write(Cue(1, 0.0, 1.0, "hi", "hi"))
+
+    assert (
+        capsys.readouterr().out == "WEBVTT\n\n1\n00:00:00.000 --> 00:00:01.000\nhi\n\n"
+    )
+
+
+def test_cue_writer_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        CueWriter("ass")
+
+
+class FakeWhisperModel:
+    def transcribe(self, audio, **kwargs):
+        return {"text": " Hello there "}
+
+
+class FakeLLM:
+    def invoke(self, prompt):
+        return AIMessage(
+            content=" สวัสดีครับ \n",
+            usage_metadata={"input_tokens": 7, "output_tokens": 3, "total_tokens": 10},
+        )
+
+
+@pytest.fixture
+def captioner_factory(monkeypatch, tmp_path):
+    config = AppConfig()
+    monkeypatch.setattr(
+        live.captioner, "use_whisper_model", fake_whisper_model, raising=True
+    )
+    monkeypatch.setattr(config, "get_llm_model", lambda: FakeLLM())
+
+    def factory(**kwargs):
+        writer = CueWriter("srt", str(tmp_path / "live.srt"))
+        captioner = LiveCaptioner(writer, **kwargs)
+        captioner.segmenter = segmenter()
+        return captioner
+
+    return factory
+
+
+class fake_whisper_model:
+    def __init__(self, model_size):
+        pass
+
+    def __enter__(self):
+        return FakeWhisperModel()
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_captioner_translates_utterances(captioner_factory, tmp_path):
+    captioner = captioner_factory(latency_budget=30.0)
+
+    stats = captioner.run(frames("..SSSS....SSSS....", time.monotonic() - 1))
+
+    assert stats["cues"] == 2
+    assert stats["untranslated"] == 0
+    assert stats["token_usage"]["live_translate"]["input_tokens"] == 14
+    assert (tmp_path / "live.srt").read_text(encoding="utf-8").count("สวัสดีครับ\n") == 2
+
+
+def test_zero_latency_budget_emits_transcripts(captioner_factory, tmp_path):
+    captioner = captioner_factory(latency_budget=0.0)
+
+    stats = captioner.run(frames("..SSSS....", time.monotonic() - 1))
+
+    assert captioner.latency_budget == 0.0
+    assert stats["untranslated"] == 1
+    assert "Hello there" in (tmp_path / "live.srt").read_text(encoding="utf-8")
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from config.llm_router import LLMEndpoint, LLMRouter, parse_endpoints
+from processors.summarizer import Summarizer
+from workflow.state import State
+
+
+class FakeClient:
+    def __init__(self, delay=0.0, error=None, input_tokens=10, output_tokens=5):
+        self.delay = delay
+        self.error = error
+        self.usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        self.cancelled = False
+
+    async def ainvoke(self, prompt, **kwargs):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return AIMessage(content="ok", usage_metadata=self.usage)
+
+
+def endpoint(name, client, weight=1.0, latency=None):
+    endpoint = LLMEndpoint("fake", name, client, weight, window=10)
+    if latency is not None:
+        endpoint.latencies.extend([latency] * 5)
+    return endpoint
+
+
+def test_parse_endpoints():
+    assert parse_endpoints(
+        "openai:gpt-4o-mini@3=https://api.openai.com/v1, ollama:llama3:8b"
+    ) == [
+        ("openai", "gpt-4o-mini", 3.0, "https://api.openai.com/v1"),
+        ("ollama", "llama3:8b", 1.0, ""),
+    ]
+
+
+def test_parse_endpoints_rejects_missing_provider():
+    with pytest.raises(ValueError):
+        parse_endpoints("gpt-4o-mini")
+
+
+def test_slow_primary_is_hedged_and_cancelled(monkeypatch):
+    slow, fast = FakeClient(delay=5.0), FakeClient(delay=0.0, input_tokens=12)
+    primary = endpoint("slow", slow, weight=1.0, latency=0.05)
+    hedge = endpoint("fast", fast, weight=1.0)
+    router = LLMRouter([primary, hedge], min_samples=5)
+    monkeypatch.setattr(router, "_ranked_endpoints", lambda: [primary, hedge])
+
+    response = router.invoke("prompt")
+
+    assert response.response_metadata["llm_endpoint"] == "fake:fast"
+    assert response.response_metadata["llm_hedged_usage"] == [
+        {
+            "llm_endpoint": "fake:slow",
+            "input_tokens": 12,
+            "output_tokens": 0,
+            "cancelled": True,
+        }
+    ]
+    assert slow.cancelled
+
+
+def test_failed_endpoint_fails_over(monkeypatch):
+    broken = endpoint("broken", FakeClient(error=RuntimeError("boom")))
+    working = endpoint("working", FakeClient())
+    router = LLMRouter([broken, working])
+    monkeypatch.setattr(router, "_ranked_endpoints", lambda: [broken, working])
+
+    response = router.invoke("prompt")
+
+    assert response.response_metadata["llm_endpoint"] == "fake:working"
+    assert "llm_hedged_usage" not in response.response_metadata
+    assert broken.error_rate == 1.0
+
+
+def test_all_endpoints_failing_raises(monkeypatch):
+    broken = endpoint("broken", FakeClient(error=RuntimeError("boom")))
+    router = LLMRouter([broken])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        router.invoke("prompt")
+
+
+def test_hedged_usage_is_tracked_per_endpoint():
+    response = AIMessage(
+        content="ok",
+        usage_metadata={"input_tokens": 12, "output_tokens": 4, "total_tokens": 16},
+        response_metadata={
+            "llm_endpoint": "fake:fast",
+            "llm_hedged_usage": [
+                {
+                    "llm_endpoint": "fake:slow",
+                    "input_tokens": 12,
+                    "output_tokens": 0,
+                    "cancelled": True,
+                }
+            ],
+        },
+    )
+    state = State()
+
+    Summarizer("summarizer").track_token_usage(state, response)
+
+    assert state.token_usage["summarizer[fake:fast]"].total_tokens == 16
+    assert state.token_usage["summarizer[fake:slow]"].input_tokens == 12
+    assert state.total_token_usage.input_tokens == 24
@@ -0,0 +1,89 @@
+import json
+import logging
+import queue
+from collections import Counter
+
+import pytest
+
+from config.app_config import AppConfig
+from utils.logging import (
+    ContextQueueHandler,
+    JsonFormatter,
+    configure_logging,
+    log_context,
+    setup_logger,
+)
+
+
+@pytest.fixture
+def config(monkeypatch):
+    config = AppConfig()
+    monkeypatch.setattr(config, "log_level", config.log_level)
+    yield config
+    configure_logging()
+
+
+def make_record(level=logging.INFO, msg="Cue %d", args=(1,), **fields):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    for name, value in fields.items():
+        setattr(record, name, value)
+    return record
+
+
+def test_invalid_log_level_falls_back_to_info(config):
+    config.log_level = "verbose"
+
+    logger = setup_logger("test_invalid_log_level")
+
+    assert logger.level == logging.INFO
+
+
+def test_log_level_is_case_insensitive(config):
+    config.log_level = "debug"
+
+    logger = setup_logger("test_log_level_case")
+
+    assert logger.level == logging.DEBUG
+
+
+def test_records_are_queued_unformatted_with_context():
+    log_queue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+
+    with log_context(job_id="abc", node="translator"):
+        handler.emit(make_record())
+
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args) == ("Cue %d", (1,))
+    assert (record.job_id, record.node) == ("abc", "translator")
+
+
+def test_debug_records_are_sampled_per_batch():
+    log_queue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    handler.batch_sample_rate = 0.5
+
+    for batch in range(200):
+        for _ in range(3):
+            handler.emit(make_record(logging.DEBUG, job_id="job", batch=batch))
+    kept = Counter()
+    while not log_queue.empty():
+        kept[log_queue.get_nowait().batch] += 1
+
+    # Whole batches are kept or dropped
+    assert 60 < len(kept) < 140
+    assert set(kept.values()) == {3}
+
+    # Records above DEBUG are never sampled out
+    dropped = next(batch for batch in range(200) if batch not in kept)
+    handler.emit(make_record(logging.INFO, job_id="job", batch=dropped))
+    assert log_queue.get_nowait().batch == dropped
+
+
+def test_json_formatter_includes_context_fields():
+    line = JsonFormatter().format(make_record(job_id="abc", batch=3))
+
+    entry = json.loads(line)
+    assert entry["message"] == "Cue 1"
+    assert (entry["job_id"], entry["batch"]) == ("abc", 3)
+    assert "node" not in entry
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage
+
+import processors.audio_extractor
+import processors.transcriber
+from config.app_config import AppConfig
+from service.http_api import PipelineHTTPServer
+from service.job_store import COMPLETED, JobStore
+from service.pipeline_service import PipelineService
+from utils.process_audio import SAMPLE_RATE, AudioBuffer
+
+SEGMENTS = [
+    {"start": 0.0, "end": 1.0, "text": " Hello"},
+    {"start": 1.0, "end": 2.0, "text": " world"},
+]
+
+
+class FakeWhisperModel:
+    """Returns a fixed transcript once `release` is set"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+
+    def transcribe(self, audio, **kwargs):
+        self.release.wait(10)
+        return {"text": "Hello world", "segments": SEGMENTS}
+
+
+class FakeLLM:
+    """Translates every segment of a batch to the same Thai text"""
+
+    async def ainvoke(self, prompt):
+        return AIMessage(
+            content="\n[SSS]\n".join("สวัสดี" for _ in SEGMENTS),
+            usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+        )
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeWhisperModel()
+    config = AppConfig()
+    monkeypatch.setattr(processors.transcriber, "load_whisper_model", lambda _: model)
+    monkeypatch.setattr(
+        processors.audio_extractor,
+        "decode_audio_buffer",
+        lambda _: AudioBuffer(np.zeros(2 * SAMPLE_RATE, dtype=np.int16)),
+    )
+    monkeypatch.setattr(processors.audio_extractor, "apply_filters", lambda a, _: a)
+    monkeypatch.setattr(config, "get_llm_model", lambda: FakeLLM())
+    monkeypatch.setattr(config, "llm_model_name", "")
+    monkeypatch.setattr(config, "transcribe_batch_size", 1)
+    return model
+
+
+@pytest.fixture
+def service(tmp_path, model):
+    service = PipelineService(
+        db_path=str(tmp_path / "jobs.sqlite3"),
+        output_dir=str(tmp_path),
+        queue_size=1,
+        asr_workers=1,
+        llm_workers=1,
+    ).start()
+    yield service
+    model.release.set()
+    service.stop()
+
+
+@pytest.fixture
+def api(service):
+    server = PipelineHTTPServer(("127.0.0.1", 0), service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    try:
+        with urllib.request.urlopen(url, data=data, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out"
+        time.sleep(0.01)
+
+
+def test_job_runs_over_http(api):
+    status, body = request(f"{api}/jobs", {"video_path": "clip.mp4"})
+    assert status == 202
+    job_id = json.loads(body)["id"]
+
+    status, body = request(f"{api}/jobs/{job_id}/events")
+    events = [json.loads(line) for line in body.decode("utf-8").splitlines() if line]
+    batches = [event for event in events if event.get("status") == "batch_completed"]
+    assert batches[0]["segments"][0]["text"] == "สวัสดี"
+    assert events[-1]["status"] == COMPLETED
+    assert events[-1]["result"]["segments"] == 2
+
+    status, body = request(f"{api}/jobs/{job_id}")
+    job = json.loads(body)
+    assert job["status"] == COMPLETED
+    assert job["result"]["token_usage"]["whisper_translate"]["input_tokens"] == 10
+
+    status, body = request(f"{api}/jobs/{job_id}/srt")
+    assert status == 200
+    srt = body.decode("utf-8")
+    assert srt.count("สวัสดี") == 2
+    assert srt.rstrip().endswith("--> 00:00:02,000\nสวัสดี")
+
+
+def test_full_queue_is_rejected(api, service, model):
+    model.release.clear()
+    request(f"{api}/jobs", {"video_path": "first.mp4"})
+    # The first job is taken by the ASR worker, the second fills the queue
+    wait_until(service.asr_queue.empty)
+    status, _ = request(f"{api}/jobs", {"video_path": "second.mp4"})
+    assert status == 202
+
+    status, body = request(f"{api}/jobs", {"video_path": "third.mp4"})
+    assert status == 429
+    assert len(service.list_jobs()) == 2
+
+
+def test_deleted_srt_returns_gone(api, service):
+    job_id = service.submit("clip.mp4")["id"]
+    wait_until(lambda: service.get_job(job_id)["status"] == COMPLETED)
+    os.remove(service.get_job(job_id)["result"]["srt_path"])
+
+    status, _ = request(f"{api}/jobs/{job_id}/srt")
+    assert status == 410
+
+
+def test_unknown_job_returns_not_found(api):
+    status, _ = request(f"{api}/jobs/abc123")
+    assert status == 404
+
+
+def test_stop_with_full_queue_returns(tmp_path, service, model):
+    model.release.clear()
+    service.submit("first.mp4")
+    wait_until(service.asr_queue.empty)
+    second = service.submit("second.mp4")
+
+    threading.Timer(0.2, model.release.set).start()
+    started = time.monotonic()
+    service.stop()
+    assert time.monotonic() - started < 5
+
+    # Queued jobs are left for the next start
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    assert second["id"] in [job["id"] for job in store.unfinished()]
+    store.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from workflow.segments import SegmentTable
+
+
+def make_table():
+    return SegmentTable.from_dicts(
+        [
+            {"start": 0.0, "end": 1.0, "text": "hello"},
+            {"start": 1.0, "end": 2.5, "text": "world"},
+        ]
+    )
+
+
+def test_indexing_returns_read_only_segment():
+    segments = make_table()
+
+    assert segments[1] == {"start": 1.0, "end": 2.5, "text": "world"}
+    with pytest.raises(TypeError):
+        segments[1]["text"] = "fix"
+    assert segments.texts == ["hello", "world"]
+
+
+def test_iteration_returns_read_only_segments():
+    for segment in make_table():
+        with pytest.raises(TypeError):
+            segment["text"] = "fix"
+
+
+def test_item_assignment_raises():
+    with pytest.raises(TypeError):
+        make_table()[0] = {"start": 0.0, "end": 1.0, "text": "fix"}
+
+
+def test_with_text_leaves_original_unchanged():
+    segments = make_table()
+    edited = segments.with_text(0, "fix")
+
+    assert edited.texts == ["fix", "world"]
+    assert segments.texts == ["hello", "world"]
+
+
+def test_to_dicts_returns_editable_copies():
+    segments = make_table()
+    dicts = segments.to_dicts()
+    dicts[0]["text"] = "fix"
+
+    assert SegmentTable.from_dicts(dicts).texts == ["fix", "world"]
+    assert segments.texts == ["hello", "world"]
@@ -0,0 +1,70 @@
+import pytest
+
+from processors.transcriber import _split_segments
+
+TIMESTAMP_BEGIN = 1000
+
+
+class FakeTokenizer:
+    """Text tokens are character codes; timestamp tokens step by 20 ms"""
+
+    timestamp_begin = TIMESTAMP_BEGIN
+
+    def decode(self, tokens):
+        return "".join(chr(token) for token in tokens)
+
+
+def timestamp(seconds):
+    return TIMESTAMP_BEGIN + round(seconds / 0.02)
+
+
+def text(value):
+    return [ord(char) for char in value]
+
+
+def test_split_segments_at_timestamp_pairs():
+    tokens = [
+        timestamp(0.0),
+        *text(" Hello"),
+        timestamp(1.2),
+        timestamp(1.2),
+        *text(" world"),
+        timestamp(2.5),
+    ]
+
+    segments = _split_segments(FakeTokenizer(), tokens, 30.0, 30.0)
+
+    assert [segment["text"] for segment in segments] == [" Hello", " world"]
+    assert [segment["start"] for segment in segments] == pytest.approx([30.0, 31.2])
+    assert [segment["end"] for segment in segments] == pytest.approx([31.2, 32.5])
+
+
+def test_split_segments_without_timestamps_spans_the_window():
+    segments = _split_segments(FakeTokenizer(), text(" Hello"), 0.0, 4.0)
+
+    assert segments == [{"start": 0.0, "end": 4.0, "text": " Hello"}]
+
+
+def test_split_segments_closes_trailing_text_at_the_window_end():
+    tokens = [
+        timestamp(0.5),
+        *text(" Hi"),
+        timestamp(1.0),
+        timestamp(1.5),
+        *text(" cut"),
+    ]
+
+    segments = _split_segments(FakeTokenizer(), tokens, 0.0, 3.0)
+
+    assert segments[-1]["text"] == " cut"
+    assert segments[-1]["start"] == pytest.approx(1.5)
+    assert segments[-1]["end"] == pytest.approx(3.0)
+
+
+def test_split_segments_skips_empty_timestamp_pairs():
+    tokens = [timestamp(0.0), timestamp(1.0), *text(" Hi"), timestamp(2.0)]
+
+    segments = _split_segments(FakeTokenizer(), tokens, 0.0, 3.0)
+
+    assert len(segments) == 1
+    assert segments[0]["start"] == pytest.approx(1.0)
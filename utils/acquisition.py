@@ -0,0 +1,170 @@
+import glob
+import hashlib
+import os
+import re
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from utils.logging import setup_logger
+
+YOUTUBE_REGEX = r"(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})"
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def is_youtube_url(url: str) -> bool:
+    """Check if the given string is a YouTube URL."""
+    return bool(re.match(YOUTUBE_REGEX, url))
+
+
+def is_remote_url(url: str) -> bool:
+    """Check if the given string is a URL that has to be downloaded first."""
+    return urlparse(url).scheme in ("http", "https", "file")
+
+
+class MediaAcquirer:
+    """
+    Downloads remote inputs (YouTube or plain HTTP/file URLs) into a local cache.
+
+    Downloads are keyed by YouTube video ID or by a hash of the URL, so repeated
+    runs reuse the cached media. Interrupted downloads are resumed from their
+    `.part` file. `prefetch` starts a download in the background (the pipeline
+    service calls it for every queued URL). The original media is kept as-is
+    and decoded once the download completes.
+    """
+
+    # Shared by all instances, so a prefetch and an extraction using different
+    # acquirers never download the same URL into the same `.part` file
+    _locks: Dict[str, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, cache_dir: str, max_workers: int = 2, timeout: float = 60.0):
+        self.cache_dir = cache_dir
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.logger = setup_logger(f"{self.__class__.__name__}")
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+
+    def cache_key(self, url: str) -> str:
+        """Return the cache key for a URL: the YouTube video ID or a URL hash."""
+        match = re.match(YOUTUBE_REGEX, url)
+        if match:
+            return match.group(6)
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def cached_path(self, url: str) -> Optional[str]:
+        """Return the path of a completed download for the URL, if cached."""
+        pattern = os.path.join(self.cache_dir, glob.escape(self.cache_key(url)) + ".*")
+        for path in sorted(glob.glob(pattern)):
+            if not path.endswith((".part", ".ytdl")):
+                return path
+        return None
+
+    def acquire(self, url: str) -> str:
+        """Return a local path for the URL, downloading it if it is not cached."""
+        if not is_remote_url(url) and not is_youtube_url(url):
+            return url
+
+        with self._lock_for(self.cache_key(url)):
+            cached = self.cached_path(url)
+            if cached:
+                self.logger.info(f"Using cached media for {url}: {cached}")
+                return cached
+
+            self.logger.info(f"Downloading media: {url}")
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if is_youtube_url(url):
+                path = self._download_youtube(url)
+            else:
+                path = self._download_url(url)
+
+        self.logger.info(f"Media downloaded to {path}")
+        return path
+
+    def prefetch(self, url: str) -> Optional[Future]:
+        """
+        Start downloading a remote URL in the background, at most `max_workers`
+        at a time. A later `acquire` of the same URL waits for it and then uses
+        the cached file. Local paths are ignored.
+        """
+        if not is_remote_url(url) and not is_youtube_url(url):
+            return None
+
+        with self._locks_guard:
+            if self._prefetch_executor is None:
+                self._prefetch_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="prefetch"
+                )
+        return self._prefetch_executor.submit(self._prefetch, url)
+
+    def close(self) -> None:
+        """Cancel prefetches that have not started yet"""
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prefetch(self, url: str) -> Optional[str]:
+        try:
+            return self.acquire(url)
+        except Exception as e:
+            # The job's own acquire retries the download and reports the error
+            self.logger.warning(f"Prefetch of {url} failed: {str(e)}")
+            return None
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        key = os.path.join(self.cache_dir, key)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _download_youtube(self, url: str) -> str:
+        import yt_dlp
+
+        ydl_opts = {
+            "format": "bestaudio/best",
+            "outtmpl": os.path.join(self.cache_dir, "%(id)s.%(ext)s"),
+            "continuedl": True,
+            "quiet": True,
+            "noprogress": True,
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+            path = ydl.prepare_filename(info)
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Media download failed. The expected file was not found at {path}. "
+                f"Please check if the YouTube URL is valid and accessible: {url}."
+            )
+        return path
+
+    def _download_url(self, url: str) -> str:
+        extension = os.path.splitext(urlparse(url).path)[1] or ".media"
+        path = os.path.join(self.cache_dir, self.cache_key(url) + extension)
+        part_path = path + ".part"
+
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        request = urllib.request.Request(url, headers=headers)
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                # Servers that ignore the Range header send the whole file again
+                if offset and getattr(response, "status", None) != 206:
+                    self.logger.info(f"Server ignored resume request for {url}")
+                    offset = 0
+                elif offset:
+                    self.logger.info(f"Resuming download at byte {offset}")
+                with open(part_path, "ab" if offset else "wb") as f:
+                    shutil.copyfileobj(response, f, CHUNK_SIZE)
+        except urllib.error.HTTPError as e:
+            # 416: the partial file already holds the complete body
+            if e.code != 416 or not offset:
+                raise
+
+        os.replace(part_path, path)
+        return path
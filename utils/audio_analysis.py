@@ -0,0 +1,94 @@
+from typing import Dict
+
+import numpy as np
+
+from utils.process_audio import AudioBuffer
+
+# Levels below this are treated as digital silence, not as the noise floor
+SILENCE_DB = -90.0
+
+
+def _sample(audio: AudioBuffer, sample_seconds: float, windows: int = 3) -> np.ndarray:
+    """Take evenly spaced windows totalling `sample_seconds` from the audio."""
+    samples = audio.samples
+    total = int(sample_seconds * audio.sample_rate)
+    if len(samples) <= total:
+        return samples
+
+    window = total // windows
+    starts = np.linspace(0, len(samples) - window, windows).astype(int)
+    return np.concatenate([samples[start : start + window] for start in starts])
+
+
+def analyze_audio(
+    audio: AudioBuffer, sample_seconds: float = 30.0, frame_duration_ms: int = 30
+) -> Dict[str, float]:
+    """
+    Measure a sample of the audio: noise floor, SNR estimate, loudness, peak
+    level (all in dBFS / dB) and the share of clipped samples.
+
+    The noise floor is the 10th percentile of frame levels and the speech level
+    the 90th percentile; their difference is the SNR estimate.
+    """
+    sample = _sample(audio, sample_seconds).astype(np.float64) / 32768.0
+    if len(sample) == 0:
+        return {
+            "noise_floor_db": SILENCE_DB,
+            "speech_level_db": SILENCE_DB,
+            "snr_db": 0.0,
+            "loudness_db": SILENCE_DB,
+            "peak_db": SILENCE_DB,
+            "clipping_ratio": 0.0,
+        }
+
+    frame_samples = int(audio.sample_rate * frame_duration_ms / 1000)
+    frame_count = max(len(sample) // frame_samples, 1)
+    frames = sample[: frame_count * frame_samples].reshape(frame_count, -1)
+    frame_db = 20 * np.log10(np.sqrt(np.mean(frames**2, axis=1)) + 1e-10)
+    audible_db = frame_db[frame_db > SILENCE_DB]
+    if len(audible_db) == 0:
+        audible_db = frame_db
+
+    noise_floor_db = float(np.percentile(audible_db, 10))
+    speech_level_db = float(np.percentile(audible_db, 90))
+
+    return {
+        "noise_floor_db": round(noise_floor_db, 2),
+        "speech_level_db": round(speech_level_db, 2),
+        "snr_db": round(speech_level_db - noise_floor_db, 2),
+        "loudness_db": round(
+            float(20 * np.log10(np.sqrt(np.mean(sample**2)) + 1e-10)), 2
+        ),
+        "peak_db": round(float(20 * np.log10(np.max(np.abs(sample)) + 1e-10)), 2),
+        "clipping_ratio": round(float(np.mean(np.abs(sample) >= 0.999)), 6),
+    }
+
+
+def select_preset(
+    analysis: Dict[str, float],
+    min_snr_db: float = 30.0,
+    min_loudness_db: float = -30.0,
+    max_loudness_db: float = -14.0,
+    max_clipping_ratio: float = 0.001,
+) -> str:
+    """
+    Pick the cheapest filter preset for the measured audio: denoise only when
+    the SNR is low, and normalize only when loudness is out of range or the
+    audio clips. Silent or empty audio has nothing to filter and gets `clean`.
+    """
+    if analysis["peak_db"] <= SILENCE_DB:
+        return "clean"
+
+    needs_denoise = analysis["snr_db"] < min_snr_db
+    needs_normalize = (
+        not min_loudness_db <= analysis["loudness_db"] <= max_loudness_db
+        or analysis["clipping_ratio"] > max_clipping_ratio
+    )
+
+    if needs_denoise and needs_normalize:
+        return "full"
+    if needs_denoise:
+        return "denoise"
+    if needs_normalize:
+        return "normalize"
+    return "clean"
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop, started on a daemon thread on first use.
+
+    Cached chat clients keep an async connection pool that is bound to the loop
+    it was first used on, so every LLM coroutine in the process (scripts, the
+    pipeline service, Streamlit) must run on this one long-lived loop rather
+    than on a fresh `asyncio.run` loop per call.
+    """
+    global _loop
+
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="event-loop", daemon=True
+            ).start()
+            _loop = loop
+    return _loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared event loop and wait for its result"""
+    loop = get_event_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_coroutine would block the shared event loop")
+
+    # The task runs in a copy of the caller's context, so log fields carry over
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
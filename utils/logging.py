@@ -1,14 +1,154 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional, Set
 
+from config.app_config import AppConfig
 
-def setup_logger(name=None, level=logging.INFO):
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Structured fields attached to records, from `log_context` or `extra=`
+CONTEXT_FIELDS = ("job_id", "node", "batch")
+
+_log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Attach fields such as `job_id`, `node` or `batch` to every record logged in
+    this context. asyncio tasks copy the context, so each concurrent batch keeps
+    its own fields; new threads start without any.
+    """
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them, so the calling thread (often the
+    translator's event loop) only pays for a queue put. Messages are formatted
+    and written by the listener thread.
+
+    Per-batch debug records are sampled by batch: with `batch_sample_rate` 0.1
+    roughly one batch in ten keeps all of its debug lines.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue) -> None:
+        super().__init__(log_queue)
+        self.batch_sample_rate = 1.0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for field, value in _log_context.get().items():
+            if getattr(record, field, None) is None:
+                setattr(record, field, value)
+
+        if record.levelno <= logging.DEBUG and not self._sampled(record):
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def _sampled(self, record: logging.LogRecord) -> bool:
+        batch = getattr(record, "batch", None)
+        if batch is None or self.batch_sample_rate >= 1.0:
+            return True
+        key = f"{getattr(record, 'job_id', '')}:{batch}".encode()
+        return zlib.crc32(key) / 0xFFFFFFFF < self.batch_sample_rate
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = ContextQueueHandler(_queue)
+_stream_handler = logging.StreamHandler(sys.stdout)
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+# Loggers set up here, with the level they were explicitly given (if any)
+_loggers: Dict[Optional[str], Optional[int]] = {}
+_invalid_levels: Set[str] = set()
+
+
+def _resolve_level(name: str) -> int:
+    """Return the numeric level for a name like `debug`, or INFO if unknown"""
+    level = logging.getLevelName(name.strip().upper())
+    if isinstance(level, int):
+        return level
+
+    if name not in _invalid_levels:
+        _invalid_levels.add(name)
+        # No handler is configured yet, so Python's last-resort handler prints it
+        logging.getLogger(__name__).warning(
+            "Unknown LOG_LEVEL %r, using INFO. Expected one of: "
+            "DEBUG, INFO, WARNING, ERROR, CRITICAL",
+            name,
+        )
+    return logging.INFO
+
+
+def configure_logging() -> None:
+    """
+    Apply the logging settings from AppConfig (level, text or JSON format, batch
+    debug sampling) to every logger set up with `setup_logger`, and start the
+    background writer thread.
+    """
+    global _listener
+
+    config = AppConfig()
+    if config.log_format == "json":
+        _stream_handler.setFormatter(JsonFormatter())
+    else:
+        _stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+    _queue_handler.batch_sample_rate = config.log_batch_sample_rate
+
+    level = _resolve_level(config.log_level)
+    with _lock:
+        for name, explicit_level in _loggers.items():
+            logging.getLogger(name).setLevel(explicit_level or level)
+
+        if _listener is None:
+            _listener = QueueListener(_queue, _stream_handler)
+            _listener.start()
+            # Flush queued records on interpreter exit
+            atexit.register(_listener.stop)
+
+
+def setup_logger(name=None, level=None):
     """
     Set up and configure a logger
 
     Args:
         name: Logger name (defaults to root logger if None)
-        level: Logging level
+        level: Logging level (defaults to AppConfig().log_level)
 
     Returns:
         Configured logger instance
@@ -17,24 +157,14 @@ def setup_logger(name=None, level=logging.INFO):
 
     # Only configure if handlers aren't already set up
     if not logger.handlers:
-        logger.setLevel(level)
-
-        # Create console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(level)
-
-        # Create formatter with date and time
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        console_handler.setFormatter(formatter)
-
-        # Add handler to logger
-        logger.addHandler(console_handler)
+        with _lock:
+            _loggers[name] = level
+        logger.addHandler(_queue_handler)
 
         # Prevent propagation to root logger if this is a named logger
         if name:
             logger.propagate = False
 
+        configure_logging()
+
     return logger
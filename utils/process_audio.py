@@ -1,40 +1,165 @@
 import os
 import tempfile
+import time
+import wave
+from typing import Dict, Optional
 
 import ffmpeg
+import numpy as np
 
+SAMPLE_RATE = 16000
+
+# Filter chains applied after decoding, from cheapest to most expensive.
+# `afftdn` (denoising) and `loudnorm` are the costly steps.
+PRESET_FILTERS: Dict[str, str] = {
+    "clean": "highpass=f=500",
+    "normalize": "loudnorm,highpass=f=500",
+    "denoise": "afftdn,highpass=f=500",
+    "full": "afftdn,loudnorm,highpass=f=500",
+}
+
+
+class AudioBuffer:
+    """
+    Decoded mono 16-bit PCM audio held in memory and passed between processors
+    by reference, so Whisper and VAD can read it without decoding the file again.
+    """
+
+    __slots__ = ("samples", "sample_rate", "_float32")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> None:
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self._float32: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_pcm_bytes(
+        cls, pcm_bytes: bytes, sample_rate: int = SAMPLE_RATE
+    ) -> "AudioBuffer":
+        """Wrap raw s16le bytes without copying them."""
+        return cls(np.frombuffer(pcm_bytes, dtype=np.int16), sample_rate)
+
+    @property
+    def duration(self) -> float:
+        """Duration of the audio in seconds."""
+        return len(self.samples) / self.sample_rate
+
+    def as_float32(self) -> np.ndarray:
+        """Return the samples as float32 in [-1, 1], the input format Whisper expects."""
+        if self._float32 is None:
+            self._float32 = self.samples.astype(np.float32) / 32768.0
+        return self._float32
+
+    def as_bytes(self) -> memoryview:
+        """Return a zero-copy byte view of the PCM samples."""
+        return memoryview(self.samples).cast("B")
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def __repr__(self) -> str:
+        return (
+            f"AudioBuffer(samples={len(self.samples)}, "
+            f"sample_rate={self.sample_rate}, duration={self.duration:.2f}s)"
+        )
+
+
+def decode_audio_buffer(source: str) -> AudioBuffer:
+    """
+    Decode the audio stream of any ffmpeg-readable source (video or audio file
+    in any container, or URL) into a 16 kHz mono buffer.
+    """
+    pcm_bytes, _ = (
+        ffmpeg.input(source)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ar=SAMPLE_RATE, ac=1)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return AudioBuffer.from_pcm_bytes(pcm_bytes)
+
+
+def apply_filters(audio: AudioBuffer, filters: str) -> AudioBuffer:
+    """
+    Run an ffmpeg filter chain over an in-memory buffer in a single process.
+    """
+    if not filters:
+        return audio
 
-def process_audio(input_bytes, format_in="wav", format_out="wav", **options):
     process = (
-        ffmpeg.input("pipe:", format=format_in)
-        .output("pipe:", format=format_out, **options)
+        ffmpeg.input("pipe:", format="s16le", ar=audio.sample_rate, ac=1)
+        .output(
+            "pipe:",
+            format="s16le",
+            acodec="pcm_s16le",
+            af=filters,
+            ar=SAMPLE_RATE,
+            ac=1,
+        )
         .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
     )
-    output_bytes, err = process.communicate(input=input_bytes)
-    return output_bytes
+    pcm_bytes, stderr = process.communicate(input=audio.as_bytes())
+    if process.returncode:
+        # Same error `.run()` raises, so a bad filter never yields empty audio
+        raise ffmpeg.Error("ffmpeg", pcm_bytes, stderr)
+    return AudioBuffer.from_pcm_bytes(pcm_bytes)
 
 
-def extract_audio_file(input_file: str):
+def extract_audio_buffer(input_file: str, preset: str = "full") -> AudioBuffer:
     """
     Process audio with English spoken with German accent for optimal Whisper.
+    The result stays in memory as 16 kHz mono PCM.
     """
-    with open(input_file, "rb") as f:
-        mp4_bytes = f.read()
+    if preset not in PRESET_FILTERS:
+        raise ValueError(
+            f"Unknown audio preset '{preset}'. "
+            f"Expected one of: {', '.join(PRESET_FILTERS)}"
+        )
+    return apply_filters(decode_audio_buffer(input_file), PRESET_FILTERS[preset])
 
-    # Process audio in a single pipeline
-    wav_bytes = process_audio(mp4_bytes, format_in="mp4", acodec="pcm_s16le")
-    clean_bytes = process_audio(wav_bytes, af="afftdn")
-    normalized_bytes = process_audio(clean_bytes, filter_complex="loudnorm")
-    filtered_bytes = process_audio(normalized_bytes, af="highpass=f=500")
-    final_bytes = process_audio(filtered_bytes, ar=16000, ac=1)
 
-    # Create a temporary file with .wav extension
-    temp_dir = tempfile.gettempdir()
-    temp_filename = os.path.basename(os.path.splitext(input_file)[0]) + ".wav"
-    audio_path = os.path.join(temp_dir, temp_filename)
+def benchmark_presets(input_file: str) -> Dict[str, float]:
+    """
+    Return the extraction time in seconds of the input file for each preset,
+    including decoding.
+    """
+    timings = {}
+    for preset in PRESET_FILTERS:
+        started = time.perf_counter()
+        extract_audio_buffer(input_file, preset)
+        timings[preset] = time.perf_counter() - started
+    return timings
 
-    # Write the final processed audio to the temporary file
-    with open(audio_path, "wb") as f:
-        f.write(final_bytes)
 
+def load_audio_buffer(audio_path: str) -> AudioBuffer:
+    """
+    Load an audio file into memory. 16 kHz mono 16-bit WAV files are read
+    directly; anything else is decoded once with ffmpeg.
+    """
+    try:
+        with wave.open(audio_path, "rb") as wf:
+            if (
+                wf.getnchannels() == 1
+                and wf.getsampwidth() == 2
+                and wf.getframerate() == SAMPLE_RATE
+            ):
+                return AudioBuffer.from_pcm_bytes(wf.readframes(wf.getnframes()))
+    except (wave.Error, EOFError):
+        pass
+
+    return decode_audio_buffer(audio_path)
+
+
+def write_wav(audio: AudioBuffer, audio_path: str) -> str:
+    """Write an in-memory audio buffer to a 16-bit mono WAV file."""
+    with wave.open(audio_path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(audio.sample_rate)
+        wf.writeframes(audio.as_bytes())
     return audio_path
+
+
+def temp_audio_path(input_file: str) -> str:
+    """Return the temporary WAV path used for an input file."""
+    temp_dir = tempfile.gettempdir()
+    temp_filename = os.path.basename(os.path.splitext(input_file)[0]) + ".wav"
+    return os.path.join(temp_dir, temp_filename)
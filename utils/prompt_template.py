@@ -32,6 +32,21 @@ your task is to translate the following segments:
 {context}
 """
 
+LIVE_TRANSLATOR_TEMPLATE = """
+You are an expert in Software Engineer, specializing in translating live captions.
+
+Your task is to translate one English caption, transcribed from a live stream, into Thai.
+
+Instructions:
+- Correct obvious speech recognition errors, including technical terms related to LangChain, LangGraph, LLMs, and AI.
+- Do NOT translate proper names (e.g., people's names) or technical terms (e.g., programming syntax, tool).
+- The caption may be an incomplete sentence; translate only what it says.
+- Output only the Thai translation, without any explanation, formatting, or commentary.
+
+Caption:
+{context}
+"""
+
 RETRIES_WHISPER_TEMPLATE = """
 {prompt}
 
@@ -43,6 +58,24 @@ IMPORTANT: Previous attempt failed due to incorrect formatting.
 - DO NOT modify the delimiter [SSS].
 """
 
+REFINE_WHISPER_TEMPLATE = """
+You are an expert in Software Engineer, specializing in reviewing subtitle translations.
+
+Your task is to review draft Thai translations of English subtitles and correct them.
+
+Instructions:
+- Each input segment contains the English source after "EN:" and a draft Thai translation after "TH:".
+- Fix mistranslations, untranslated English text, missing content, and unnatural Thai.
+- Do NOT translate proper names (e.g., people's names) or technical terms (e.g., programming syntax, tool).
+- Segments are separated by the delimiter [SSS].
+- There are exactly {batch_length} segments. You MUST return exactly {batch_length} corrected Thai segments separated by [SSS].
+- Return only the corrected Thai text of each segment, without the "EN:" or "TH:" labels.
+- Do NOT add any explanation, formatting, or commentary.
+
+your task is to review the following segments:
+{context}
+"""
+
 CONTEXT_TRANSLATOR_TEMPLATE = """
 You are an expert in communication, language editing, and translation.
 
@@ -1,6 +1,3 @@
-from pythainlp.tokenize import word_tokenize
-
-
 def warp_text(text: str, min_length: int = 44, ratio: float = 2.0) -> str:
     """
     Wrap Thai text into multiple lines using word tokenization.
@@ -8,6 +5,8 @@ def warp_text(text: str, min_length: int = 44, ratio: float = 2.0) -> str:
     if not text:
         return ""
 
+    from pythainlp.tokenize import word_tokenize
+
     tokens = word_tokenize(text, engine="newmm")
     if not tokens:
         return ""
@@ -47,3 +46,14 @@ def combine_texts(texts: list) -> str:
     """
     combined_text = " ".join(texts)
     return combined_text
+
+
+def target_script_ratio(text: str, start: str = "\u0e00", end: str = "\u0e7f") -> float:
+    """
+    Return the share of letters in `text` that belong to the target script
+    (Thai by default). Returns 1.0 for text without letters.
+    """
+    letters = [char for char in text if char.isalpha()]
+    if not letters:
+        return 1.0
+    return sum(start <= char <= end for char in letters) / len(letters)
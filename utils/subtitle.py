@@ -11,29 +11,33 @@ class SRTFormatter:
     def __init__(self):
         self.logger = setup_logger(f"{self.__class__.__name__}")
 
-    def format_and_save(self, translated_segments, output_path):
-        # Create a folder for the output file if it doesn't exist
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    def format(self, translated_segments) -> str:
+        """Format segments as SRT text"""
+        blocks = []
+        previous_end = 0  # Track the end time of the previous segment
+
+        for i, segment in enumerate(translated_segments, start=1):
+            start = max(segment["start"], previous_end)
+            end = max(segment["end"], start + 0.001)
 
-        with open(output_path, "w", encoding="utf-8") as srt_file:
-            previous_end = 0  # Track the end time of the previous segment
+            start_time = format_timestamp(start)
+            end_time = format_timestamp(end)
+            text = warp_text(segment["text"])
 
-            len_segments = len(translated_segments)
-            for i, segment in enumerate(translated_segments, start=1):
-                start = max(segment["start"], previous_end)
-                end = max(segment["end"], start + 0.001)
+            previous_end = end
 
-                start_time = format_timestamp(start)
-                end_time = format_timestamp(end)
-                text = warp_text(segment["text"])
+            blocks.append(f"{i}\n{start_time} --> {end_time}\n{text}")
 
-                previous_end = end
+        return "\n\n".join(blocks)
 
-                srt_file.write(f"{i}\n")
-                srt_file.write(f"{start_time} --> {end_time}\n")
-                srt_file.write(f"{text}")
+    def format_and_save(self, translated_segments, output_path):
+        # Create a folder for the output file if it doesn't exist
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
-                if i < len_segments:
-                    srt_file.write("\n\n")
+        # Write to a temporary file first so an existing SRT is replaced atomically
+        temp_path = f"{output_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as srt_file:
+            srt_file.write(self.format(translated_segments))
+        os.replace(temp_path, output_path)
         self.logger.info(f"Subtitles generated successfully: {output_path}")
         return output_path
@@ -1,6 +1,4 @@
-import wave
-
-import webrtcvad
+from utils.process_audio import AudioBuffer
 
 
 def format_timestamp(seconds):
@@ -13,23 +11,23 @@ def format_timestamp(seconds):
     return f"{hours:02d}:{minutes:02d}:{int(seconds):02d},{milliseconds:03d}"
 
 
-def fix_first_speech_timestamp(wav_path, frame_duration_ms=30) -> float:
+def find_first_speech_timestamp(audio: AudioBuffer, frame_duration_ms=30) -> float:
     """
-    Returns the timestamp (in seconds) of the first frame that contains speech.
+    Returns the timestamp (in seconds) of the first frame that contains speech,
+    reading frames directly from an in-memory audio buffer.
     """
+    import webrtcvad
+
     vad = webrtcvad.Vad(3)
 
-    with wave.open(wav_path, "rb") as wf:
-        sample_rate = wf.getframerate()
-        frame_samples = int(sample_rate * frame_duration_ms / 1000)
-        frame_bytes = frame_samples * 2
+    sample_rate = audio.sample_rate
+    frame_samples = int(sample_rate * frame_duration_ms / 1000)
+    frame_bytes = frame_samples * 2
+    pcm = audio.as_bytes()
 
-        timestamp = 0.0
-        while True:
-            frame = wf.readframes(frame_samples)
-            if len(frame) < frame_bytes:
-                break
-            if vad.is_speech(frame, sample_rate):
-                return timestamp
-            timestamp += frame_duration_ms / 1000.0
+    timestamp = 0.0
+    for offset in range(0, len(pcm) - frame_bytes + 1, frame_bytes):
+        if vad.is_speech(pcm[offset : offset + frame_bytes], sample_rate):
+            return timestamp
+        timestamp += frame_duration_ms / 1000.0
     return timestamp
@@ -1,45 +1,56 @@
-from langgraph.graph import StateGraph
-
-from processors.audio_extractor import AudioExtractor
-from processors.summarizer import Summarizer
-from processors.transcriber import TranscribeAudio
-from processors.translator import ContextTranslator, WhisperTranslator
 from workflow.state import State
 
 
 class GraphBuilder:
-    """Builder Pattern for creating LangGraph workflow"""
+    """
+    Builder Pattern for creating LangGraph workflow.
+
+    Processors are imported when their node is added, so heavy dependencies
+    (Whisper/torch, yt-dlp, langchain) are only loaded by workflows that use them.
+    """
 
     def __init__(self):
+        from langgraph.graph import StateGraph
+
         self.workflow = StateGraph(State)
         self.entry_point = None
 
     def add_audio_extractor(self, node_name):
         """Add audio extractor to the workflow"""
-        audio_extractor = AudioExtractor()
+        from processors.audio_extractor import AudioExtractor
+
+        audio_extractor = AudioExtractor(node_name)
         self.workflow.add_node(node_name, lambda state: audio_extractor.process(state))
         return self
 
     def add_transcriber(self, node_name):
         """Add transcriber to the workflow"""
-        transcriber = TranscribeAudio()
+        from processors.transcriber import TranscribeAudio
+
+        transcriber = TranscribeAudio(node_name)
         self.workflow.add_node(node_name, lambda state: transcriber.process(state))
         return self
 
     def add_summarizer(self, node_name):
         """Add summarizer to the workflow"""
+        from processors.summarizer import Summarizer
+
         summarizer = Summarizer(node_name)
         self.workflow.add_node(node_name, lambda state: summarizer.process(state))
         return self
 
     def add_whisper_translator(self, node_name):
         """Add whisper translator to the workflow"""
+        from processors.translator import WhisperTranslator
+
         translator = WhisperTranslator(node_name)
         self.workflow.add_node(node_name, lambda state: translator.process(state))
         return self
 
     def add_context_translator(self, node_name):
         """Add context translator to the workflow"""
+        from processors.translator import ContextTranslator
+
         translator = ContextTranslator(node_name)
         self.workflow.add_node(node_name, lambda state: translator.process(state))
         return self
@@ -0,0 +1,173 @@
+from array import array
+from difflib import SequenceMatcher
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+
+class SegmentTable:
+    """
+    Compact, array-backed table of timed subtitle segments.
+
+    Start and end times live in `array("d")` columns and texts in a plain list,
+    so a table can be referenced from `State` without pydantic copying or
+    re-validating thousands of per-segment dicts at every node. Iterating or
+    indexing yields read-only `{"start", "end", "text"}` mappings for existing
+    consumers, so `segments[i]["text"] = ...` raises instead of silently
+    editing a copy. Tables are treated as immutable: derive edited ones with
+    `with_text`/`with_texts`.
+    """
+
+    __slots__ = ("starts", "ends", "texts")
+
+    def __init__(
+        self,
+        starts: Iterable[float] = (),
+        ends: Iterable[float] = (),
+        texts: Iterable[str] = (),
+    ) -> None:
+        self.starts = starts if isinstance(starts, array) else array("d", starts)
+        self.ends = ends if isinstance(ends, array) else array("d", ends)
+        self.texts = texts if isinstance(texts, list) else list(texts)
+
+        if not len(self.starts) == len(self.ends) == len(self.texts):
+            raise ValueError(
+                "Segment columns must have the same length "
+                f"(starts={len(self.starts)}, ends={len(self.ends)}, "
+                f"texts={len(self.texts)})"
+            )
+
+    @classmethod
+    def from_dicts(cls, segments: Iterable[Dict[str, Any]]) -> "SegmentTable":
+        """Build a table from a list of `{"start", "end", "text"}` dicts."""
+        starts = array("d")
+        ends = array("d")
+        texts = []
+        for segment in segments:
+            starts.append(segment["start"])
+            ends.append(segment["end"])
+            texts.append(segment["text"])
+        return cls(starts, ends, texts)
+
+    @classmethod
+    def from_segments(
+        cls, segments: Union["SegmentTable", Sequence[Dict[str, Any]]]
+    ) -> "SegmentTable":
+        """Return `segments` as a table, converting from dicts only if needed."""
+        if isinstance(segments, cls):
+            return segments
+        return cls.from_dicts(segments)
+
+    def with_texts(self, texts: Iterable[str]) -> "SegmentTable":
+        """Return a table with the same timing and new texts."""
+        return SegmentTable(self.starts, self.ends, list(texts))
+
+    def with_text(self, index: int, text: str) -> "SegmentTable":
+        """Return a copy of the table with the text of one segment replaced."""
+        table = self.copy()
+        table.texts[index] = text
+        return table
+
+    def copy(self) -> "SegmentTable":
+        """Return a table with its own copies of the columns."""
+        return SegmentTable(
+            array("d", self.starts), array("d", self.ends), list(self.texts)
+        )
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return the segments as a list of dicts."""
+        return [
+            {"start": start, "end": end, "text": text}
+            for start, end, text in zip(self.starts, self.ends, self.texts)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        for start, end, text in zip(self.starts, self.ends, self.texts):
+            yield MappingProxyType({"start": start, "end": end, "text": text})
+
+    def __setitem__(self, index, value) -> None:
+        raise TypeError(
+            "SegmentTable is immutable; use with_text() or build a new table "
+            "with from_dicts()"
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SegmentTable(self.starts[index], self.ends[index], self.texts[index])
+        return MappingProxyType(
+            {
+                "start": self.starts[index],
+                "end": self.ends[index],
+                "text": self.texts[index],
+            }
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SegmentTable):
+            return NotImplemented
+        return (
+            self.starts == other.starts
+            and self.ends == other.ends
+            and self.texts == other.texts
+        )
+
+    def __repr__(self) -> str:
+        return f"SegmentTable({len(self)} segments)"
+
+
+def align_segments(
+    old: SegmentTable, new: SegmentTable, max_shift: float = 2.0
+) -> Dict[int, int]:
+    """
+    Align an edited segment list with the one it was derived from.
+
+    Returns a mapping from indices in `new` to indices in `old` for segments
+    whose text is unchanged (ignoring surrounding whitespace) and whose start
+    time moved by at most `max_shift` seconds. Every other index in `new` is
+    new or edited.
+    """
+    matcher = SequenceMatcher(
+        None,
+        [" ".join(text.split()) for text in old.texts],
+        [" ".join(text.split()) for text in new.texts],
+        autojunk=False,
+    )
+
+    unchanged = {}
+    for block in matcher.get_matching_blocks():
+        for offset in range(block.size):
+            old_index = block.a + offset
+            new_index = block.b + offset
+            if abs(new.starts[new_index] - old.starts[old_index]) <= max_shift:
+                unchanged[new_index] = old_index
+    return unchanged
+
+
+def changed_ranges(
+    changed: Iterable[int], total: int, context: int = 0
+) -> List[Tuple[int, int]]:
+    """
+    Group changed indices into `[start, end)` ranges widened by `context`
+    segments on each side, merging ranges that touch or overlap.
+    """
+    ranges: List[Tuple[int, int]] = []
+    for index in sorted(changed):
+        start = max(index - context, 0)
+        end = min(index + context + 1, total)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+        else:
+            ranges.append((start, end))
+    return ranges
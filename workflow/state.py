@@ -1,6 +1,8 @@
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from utils.process_audio import AudioBuffer
 
 
 class TokenUsage(BaseModel):
@@ -46,11 +48,17 @@ class State(BaseModel):
     State model for processing workflow.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     video_path: str = ""
     audio_path: str = ""
+    audio: Optional[AudioBuffer] = Field(default=None, repr=False)
     context: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     token_usage: Dict[str, TokenUsage] = Field(default_factory=dict)
+    on_progress: Optional[Callable[[str, Dict[str, Any]], None]] = Field(
+        default=None, repr=False
+    )
 
     @property
     def total_token_usage(self) -> TokenUsage:
@@ -72,3 +80,10 @@ class State(BaseModel):
             self.token_usage[processor_name] += usage
         else:
             self.token_usage[processor_name] = usage
+
+    def report_progress(self, stage: str, **progress: Any) -> None:
+        """
+        Report progress of a processing stage to the `on_progress` callback, if any.
+        """
+        if self.on_progress is not None:
+            self.on_progress(stage, progress)
@@ -1,5 +1,3 @@
-from langgraph.graph import END
-
 from workflow.graph_builder import GraphBuilder
 
 
@@ -9,6 +7,8 @@ class WorkflowFactory:
     @staticmethod
     def transcribe_summarize_translate_workflow():
         """Create a workflow that transcribes, summarizes, and translates"""
+        from langgraph.graph import END
+
         builder = GraphBuilder()
         builder.add_audio_extractor("audio_extractor")
         builder.add_transcriber("transcriber")
@@ -25,6 +25,8 @@ class WorkflowFactory:
     @staticmethod
     def transcribe_translate_workflow():
         """Create a workflow that extracts audio, transcribes, and translates"""
+        from langgraph.graph import END
+
         builder = GraphBuilder()
         builder.add_transcriber("transcriber")
         builder.add_whisper_translator("whisper_translate")
@@ -33,3 +35,43 @@ class WorkflowFactory:
         builder.add_edge("whisper_translate", END)
 
         return builder.build()
+
+    @staticmethod
+    def transcribe_workflow():
+        """Create a workflow that extracts audio and transcribes it"""
+        from langgraph.graph import END
+
+        builder = GraphBuilder()
+        builder.add_audio_extractor("audio_extractor")
+        builder.add_transcriber("transcriber")
+
+        builder.add_edge("audio_extractor", "transcriber")
+        builder.add_edge("transcriber", END)
+
+        return builder.build()
+
+    @staticmethod
+    def translate_workflow():
+        """Create a workflow that translates an existing transcript"""
+        from langgraph.graph import END
+
+        builder = GraphBuilder()
+        builder.add_whisper_translator("whisper_translate")
+
+        builder.add_edge("whisper_translate", END)
+
+        return builder.build()
+
+    @staticmethod
+    def summarize_translate_workflow():
+        """Create a workflow that summarizes and translates an existing transcript"""
+        from langgraph.graph import END
+
+        builder = GraphBuilder()
+        builder.add_summarizer("summarizer")
+        builder.add_whisper_translator("whisper_translate")
+
+        builder.add_edge("summarizer", "whisper_translate")
+        builder.add_edge("whisper_translate", END)
+
+        return builder.build()